@@ -1,5 +1,4 @@
 import json
-import yaml
 import time
 import os
 import asyncio
@@ -10,6 +9,7 @@ from src.agent.tool_executor import ToolExecutor
 from src.agent.memory import MemoryPort, Message
 from src.agent.prompt_builder import PromptBuilder
 from src.utils.paths import get_absolute_path
+from src.utils.yaml_loader import safe_load
 
 # Try to import tiktoken for accurate token counting. If unavailable, fall back to a
 # conservative character-based estimate (4 chars ~= 1 token).
@@ -89,7 +89,7 @@ class Agent:
         
         try:
             with open(get_absolute_path("tools.yaml"), 'r') as f:
-                tools_config = yaml.safe_load(f)
+                tools_config = safe_load(f)
             
             openai_tools = []
             for tool in tools_config.get("tools", []):
@@ -133,7 +133,11 @@ class Agent:
             for retry_attempt in range(max_retries):
                 try:
                     tools_param = self.tools if self.tools else None
-                    response = await self.llm_client.get_response(messages=messages, tools=tools_param)
+                    response = await self.llm_client.get_response(
+                        messages=messages,
+                        tools=tools_param,
+                        prompt_cache_key=self.thread_id
+                    )
                     if response and response.choices:
                         break  # Success, exit retry loop
                     else:
@@ -234,7 +238,7 @@ class Agent:
                     
                     # Execute the tool
                     tool_start_time = time.time()
-                    tool_output = self.tool_executor.execute_tool(tool_name, params)
+                    tool_output = await self.tool_executor.execute_tool_async(tool_name, params)
                     tool_duration = time.time() - tool_start_time
                     
                     # Track in scratch memory
@@ -342,7 +346,7 @@ class Agent:
         
         # Load personality prompt template
         with open(get_absolute_path("prompts.yaml"), 'r') as f:
-            prompts = yaml.safe_load(f)
+            prompts = safe_load(f)
         
         personality_prompt = prompts.get('personality_enhancement', '')
         personality_prompt = personality_prompt.replace("{user_request}", user_request)
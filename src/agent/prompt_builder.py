@@ -1,8 +1,8 @@
 from typing import List, Dict, Any
-import yaml
 
 from src.agent.memory import Message
 from src.utils.paths import get_absolute_path
+from src.utils.yaml_loader import safe_load
 
 
 class PromptBuilder:
@@ -13,7 +13,7 @@ class PromptBuilder:
     def _load_prompts(self):
         try:
             with open(get_absolute_path("prompts.yaml"), 'r') as f:
-                self.prompts = yaml.safe_load(f)
+                self.prompts = safe_load(f)
         except Exception as e:
             print(f"Error loading prompts: {e}")
             self.prompts = {}
@@ -45,10 +45,15 @@ class PromptBuilder:
                     "tool_calls": msg.meta["tool_calls"]
                 })
             else:
-                messages.append({
+                message = {
                     "role": msg.role,
                     "content": msg.content
-                })
+                }
+                # Stable prefixes (e.g. the Brain's init prompt) are flagged so the
+                # client can mark them for provider prompt caching
+                if msg.meta and msg.meta.get("cache_hint"):
+                    message["cache_hint"] = True
+                messages.append(message)
         
         # Don't add user_text again - it's already in recent messages
         
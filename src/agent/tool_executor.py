@@ -1,5 +1,7 @@
+import asyncio
 import os
 import importlib.util
+import inspect
 from pathlib import Path
 
 class ToolExecutor:
@@ -7,9 +9,11 @@ class ToolExecutor:
     Dynamically loads and executes tools from a specified command directory.
     This class acts as a plugin loader and dispatcher.
     """
-    def __init__(self, commands_dir="src/commands"):
+    def __init__(self, commands_dir="src/commands", commands: dict = None):
         self.commands_dir = Path(commands_dir)
-        self.commands = self._load_commands()
+        # Executors can share already loaded commands instead of importing
+        # every command module again
+        self.commands = commands if commands is not None else self._load_commands()
 
     def _load_commands(self) -> dict:
         """
@@ -47,8 +51,31 @@ class ToolExecutor:
         if tool_name in self.commands:
             command = self.commands[tool_name]
             try:
-                return command.execute(params)
+                return command.execute(self._prepare_params(tool_name, params))
             except Exception as e:
                 return f"Error executing tool '{tool_name}': {e}"
         else:
             return f"Error: Unknown tool '{tool_name}'"
+
+    async def execute_tool_async(self, tool_name: str, params: dict) -> str:
+        """
+        Like execute_tool, but awaits a command's execute_async when it has
+        one and runs other commands in a worker thread, so a long-running
+        tool never blocks the caller's event loop.
+        """
+        if tool_name in self.commands:
+            command = self.commands[tool_name]
+            try:
+                params = self._prepare_params(tool_name, params)
+                execute_async = getattr(command, "execute_async", None)
+                if execute_async is not None and inspect.iscoroutinefunction(execute_async):
+                    return await execute_async(params)
+                return await asyncio.to_thread(command.execute, params)
+            except Exception as e:
+                return f"Error executing tool '{tool_name}': {e}"
+        else:
+            return f"Error: Unknown tool '{tool_name}'"
+
+    def _prepare_params(self, tool_name: str, params: dict) -> dict:
+        """Hook for subclasses to adjust a tool's params before it runs."""
+        return params
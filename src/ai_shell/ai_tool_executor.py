@@ -4,14 +4,14 @@ from src.utils.paths import get_absolute_path
 
 class AIShellToolExecutor(ToolExecutor):
     
-    def __init__(self, commands_dir=None, command_executor=None):
+    def __init__(self, commands_dir=None, command_executor=None, commands: dict = None):
         # Use absolute path to commands directory
         if commands_dir is None:
             commands_dir = str(get_absolute_path("src/commands"))
-        super().__init__(commands_dir)
+        super().__init__(commands_dir, commands)
         self.command_executor = command_executor
     
-    def execute_tool(self, tool_name: str, params: dict) -> str:
+    def _prepare_params(self, tool_name: str, params: dict) -> dict:
         # Auto-inject current working directory for tools that support it
         if self.command_executor:
             current_dir = self.command_executor.get_current_directory()
@@ -26,4 +26,4 @@ class AIShellToolExecutor(ToolExecutor):
                 params = params.copy()
                 params['search_dir'] = current_dir
         
-        return super().execute_tool(tool_name, params)
+        return params
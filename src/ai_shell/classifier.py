@@ -7,6 +7,7 @@ from src.config.settings import AppSettings
 from src.llm.types import LLMConfig
 from src.rag.prompt_templates import PromptTemplateManager
 from src.ai_shell.config import ai_shell_config
+from src.ai_shell.semantic_cache import SemanticCache
 
 
 class CommandClassifier:
@@ -20,6 +21,17 @@ class CommandClassifier:
             classifier_config = AppSettings.get_llm_config("gpt_4_1")
             self.llm_client = LLMClient(classifier_config)
         self.classification_cache = {}
+        
+        # Second cache tier: reuse results for paraphrases of earlier inputs
+        self.semantic_cache = None
+        if ai_shell_config.semantic_cache_enabled:
+            self.semantic_cache = SemanticCache(
+                threshold=ai_shell_config.semantic_cache_threshold,
+                max_entries=ai_shell_config.semantic_cache_max_entries,
+                cache_file=ai_shell_config.semantic_cache_file
+            )
+            self.semantic_cache.warm_up()
+        
         self.template_manager = PromptTemplateManager()
         
         self.classification_tools = [{
@@ -155,10 +167,27 @@ class CommandClassifier:
             self.classification_cache[cache_key] = result
             return result
         
+        # Until the embedding model has loaded in the background, inputs go
+        # straight to the LLM rather than waiting on it
+        embedding = None
+        if self.semantic_cache and self.semantic_cache.ready:
+            try:
+                embedding = await asyncio.to_thread(self.semantic_cache.embed, user_input)
+                result = self.semantic_cache.lookup(embedding)
+                if result:
+                    self.classification_cache[cache_key] = result
+                    return result
+            except Exception as e:
+                if ai_shell_config.debug_mode:
+                    print(f"Semantic cache error: {e}")
+                embedding = None
+        
         try:
             is_command, confidence = await self._classify_with_ai(user_input, command_history)
             result = (is_command, confidence)
             self.classification_cache[cache_key] = result
+            if embedding is not None and confidence >= ai_shell_config.classification_confidence_threshold:
+                self.semantic_cache.add(embedding, result)
             return result
         except Exception as e:
             print(f"Classification error: {e}")
@@ -195,3 +224,11 @@ class CommandClassifier:
             return args.get("is_command", True), args.get("confidence", 0.5)
         
         return True, 0.1
+    
+    def save_cache(self) -> None:
+        
+        if self.semantic_cache:
+            try:
+                self.semantic_cache.save()
+            except Exception as e:
+                print(f"Could not save classifier cache: {e}")
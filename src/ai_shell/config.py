@@ -1,8 +1,8 @@
 import os
-import yaml
 from dataclasses import dataclass
 from pathlib import Path
 from src.utils.paths import get_absolute_path
+from src.utils.yaml_loader import safe_load
 
 
 @dataclass
@@ -22,6 +22,11 @@ class AIShellConfig:
     
     cache_ttl_seconds: int = 3600
     
+    semantic_cache_enabled: bool = False
+    semantic_cache_threshold: float = 0.92
+    semantic_cache_max_entries: int = 1024
+    semantic_cache_file: Path = Path.home() / ".ai_shell_classifier_cache.npz"
+    
     api_timeout_seconds: int = 10
     command_timeout_seconds: int = 30
     
@@ -48,7 +53,7 @@ def _load_ai_shell_config() -> AIShellConfig:
     try:
         config_path = get_absolute_path("config.yaml")
         with open(config_path, "r") as f:
-            yaml_config = yaml.safe_load(f) or {}
+            yaml_config = safe_load(f) or {}
         
         ai_shell_config = yaml_config.get("ai_shell", {})
         
@@ -58,6 +63,10 @@ def _load_ai_shell_config() -> AIShellConfig:
             max_command_history=ai_shell_config.get("max_history", 50),
             max_output_length=ai_shell_config.get("max_output_length", 1000),
             classification_confidence_threshold=ai_shell_config.get("classification_confidence_threshold", 0.7),
+            semantic_cache_enabled=ai_shell_config.get("semantic_cache_enabled", False),
+            semantic_cache_threshold=ai_shell_config.get("semantic_cache_threshold", 0.92),
+            semantic_cache_max_entries=ai_shell_config.get("semantic_cache_max_entries", 1024),
+            semantic_cache_file=Path(ai_shell_config.get("semantic_cache_file", AIShellConfig.semantic_cache_file)).expanduser(),
         )
     except Exception as e:
         print(f"Warning: Could not load AI Shell config from config.yaml: {e}")
@@ -3,9 +3,11 @@ import tempfile
 import subprocess
 import paramiko
 import asyncio
+from collections import deque
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
-from typing import Tuple, Dict, List, Optional
+from typing import Tuple, Dict, List, Optional, Deque
 from src.ai_shell.config import ai_shell_config
 
 
@@ -13,9 +15,10 @@ class CommandExecutor:
     
     def __init__(self):
         self.ssh = self._setup_ssh()
-        self.command_history: List[Dict] = []
-        self.current_directory = os.getcwd()
         self.max_history = ai_shell_config.max_command_history
+        # Bounded ring buffer: old entries fall off without re-slicing the list
+        self.command_history: Deque[Dict] = deque(maxlen=self.max_history)
+        self.current_directory = os.getcwd()
         
         self.stateful_commands = ['cd', 'export', 'alias', 'unalias', 'source', '.']
         
@@ -211,7 +214,7 @@ class CommandExecutor:
         except Exception as e:
             print(f"SSH state sync failed: {e}")
     
-    def _add_to_history(self, command: str, output: str, exit_code: int):
+    def _add_to_history(self, command: str, output: str, exit_code: int) -> Dict:
         
         entry = {
             'command': command,
@@ -222,9 +225,7 @@ class CommandExecutor:
         }
         
         self.command_history.append(entry)
-        
-        if len(self.command_history) > self.max_history:
-            self.command_history = self.command_history[-self.max_history:]
+        return entry
     
     def is_stateful_command(self, command: str) -> bool:
         
@@ -233,7 +234,12 @@ class CommandExecutor:
     
     def get_recent_history(self, n: int = 10) -> List[Dict]:
         
-        return self.command_history[-n:] if self.command_history else []
+        start = max(0, len(self.command_history) - n)
+        return list(islice(self.command_history, start, None))
+    
+    def get_last_entry(self) -> Optional[Dict]:
+        
+        return self.command_history[-1] if self.command_history else None
     
     def get_current_directory(self) -> str:
         
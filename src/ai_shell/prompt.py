@@ -0,0 +1,90 @@
+import os
+import re
+
+from prompt_toolkit import PromptSession
+from prompt_toolkit.completion import Completer, Completion
+from prompt_toolkit.formatted_text import ANSI
+from prompt_toolkit.history import History
+
+
+class ShellCompleter(Completer):
+    """Adapts the shell's readline-style completion to prompt_toolkit."""
+    
+    def __init__(self, get_matches, delims: str):
+        self.get_matches = get_matches
+        self._word_re = re.compile("[^" + re.escape(delims) + "]*$")
+    
+    def get_completions(self, document, complete_event):
+        text = self._word_re.search(document.text_before_cursor).group()
+        for match in self.get_matches(text):
+            yield Completion(match, start_position=-len(text))
+
+
+class ReadlineHistory(History):
+    """
+    History kept in readline's format, one entry per line, so the file stays
+    shared with the readline fallback, and capped at max_history entries.
+    """
+    
+    def __init__(self, filename, max_history: int):
+        self.filename = str(filename)
+        self.max_history = max_history
+        self._lines = 0
+        self._last = None
+        super().__init__()
+    
+    def load_history_strings(self):
+        try:
+            with open(self.filename, "rb") as f:
+                lines = f.read().decode("utf-8", errors="replace").splitlines()
+        except FileNotFoundError:
+            return []
+        
+        # Files written by prompt_toolkit's FileHistory start with a blank
+        # line and a "# timestamp" line, with each entry prefixed by "+"
+        if len(lines) > 1 and not lines[0] and lines[1].startswith("# "):
+            lines = [line[1:] for line in lines if line.startswith("+")]
+            self._rewrite(lines[-self.max_history:])
+        
+        lines = [line for line in lines if line][-self.max_history:]
+        self._lines = len(lines)
+        self._last = lines[-1] if lines else None
+        # Newest entries go first
+        return reversed(lines)
+    
+    def store_string(self, string: str) -> None:
+        string = string.replace("\n", " ")
+        # Repeated commands are stored once, as the readline path does
+        if not string or string == self._last:
+            return
+        self._last = string
+        
+        with open(self.filename, "ab") as f:
+            f.write(f"{string}\n".encode("utf-8"))
+        self._lines += 1
+        
+        # Trim in batches rather than rewriting the file on every entry
+        if self._lines > self.max_history + max(self.max_history // 10, 1):
+            self._rewrite(self.get_strings()[-self.max_history:])
+    
+    def _rewrite(self, lines) -> None:
+        lines = [line for i, line in enumerate(lines) if line and (i == 0 or line != lines[i - 1])]
+        tmp_file = f"{self.filename}.tmp"
+        with open(tmp_file, "wb") as f:
+            f.write("".join(f"{line}\n" for line in lines).encode("utf-8"))
+        os.replace(tmp_file, self.filename)
+        self._lines = len(lines)
+
+
+class ShellPrompt:
+    """Reads input lines on the event loop itself instead of a worker thread."""
+    
+    def __init__(self, history_file, get_matches, delims: str, max_history: int = 1000):
+        self._session = PromptSession(
+            history=ReadlineHistory(history_file, max_history),
+            completer=ShellCompleter(get_matches, delims),
+            complete_while_typing=False
+        )
+    
+    async def read(self, prompt: str) -> str:
+        return await self._session.prompt_async(ANSI(prompt))
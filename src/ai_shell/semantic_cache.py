@@ -0,0 +1,122 @@
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Classification results keyed by input embedding. Lookups match paraphrases
+    ("list files" / "show files") by cosine similarity against every cached
+    input in a single matrix-vector product.
+    """
+    
+    def __init__(self, threshold: float = 0.92, max_entries: int = 1024,
+                 cache_file: Optional[Path] = None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.cache_file = cache_file
+        self._embedding_function = None
+        self._model_lock = threading.Lock()
+        self._embeddings: Optional[np.ndarray] = None
+        self._results: List[Tuple[bool, float]] = []
+        self._last_used = np.zeros(0, dtype=np.int64)
+        self._clock = 0
+        
+        if cache_file:
+            self._load()
+    
+    @property
+    def ready(self) -> bool:
+        return self._embedding_function is not None
+    
+    def warm_up(self) -> None:
+        """Load the embedding model in a background thread"""
+        threading.Thread(target=self._warm_up, name="semantic-cache-warmup", daemon=True).start()
+    
+    def _warm_up(self) -> None:
+        try:
+            self._get_embedding_function()
+        except Exception as e:
+            print(f"Warning: Could not load classifier cache embedding model: {e}")
+    
+    def _get_embedding_function(self):
+        # Loading the local MiniLM model (and downloading it on first use) is
+        # slow, so it happens once, off the interactive path via warm_up()
+        with self._model_lock:
+            if self._embedding_function is None:
+                import chromadb.utils.embedding_functions as embedding_functions
+                self._embedding_function = embedding_functions.DefaultEmbeddingFunction()
+        return self._embedding_function
+    
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self._get_embedding_function()([text])[0], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def lookup(self, embedding: np.ndarray) -> Optional[Tuple[bool, float]]:
+        if not self._results or self._embeddings.shape[1] != embedding.shape[0]:
+            return None
+        
+        similarities = self._embeddings @ embedding
+        best = int(similarities.argmax())
+        if similarities[best] < self.threshold:
+            return None
+        
+        self._touch(best)
+        return self._results[best]
+    
+    def add(self, embedding: np.ndarray, result: Tuple[bool, float]) -> None:
+        if self._embeddings is None or self._embeddings.shape[1] != embedding.shape[0]:
+            self._embeddings = np.empty((0, embedding.shape[0]), dtype=np.float32)
+            self._results = []
+            self._last_used = np.zeros(0, dtype=np.int64)
+        
+        if len(self._results) < self.max_entries:
+            self._embeddings = np.vstack([self._embeddings, embedding])
+            self._results.append(result)
+            self._last_used = np.append(self._last_used, 0)
+            index = len(self._results) - 1
+        else:
+            # Evict the least recently used entry
+            index = int(self._last_used.argmin())
+            self._embeddings[index] = embedding
+            self._results[index] = result
+        
+        self._touch(index)
+    
+    def _touch(self, index: int) -> None:
+        self._clock += 1
+        self._last_used[index] = self._clock
+    
+    def _load(self) -> None:
+        try:
+            with np.load(self.cache_file) as data:
+                self._embeddings = data["embeddings"].astype(np.float32)
+                self._results = [
+                    (bool(is_command), float(confidence))
+                    for is_command, confidence in zip(data["is_command"], data["confidence"])
+                ]
+                self._last_used = data["last_used"].astype(np.int64)
+            self._clock = int(self._last_used.max()) if len(self._last_used) else 0
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: Could not load classifier cache from {self.cache_file}: {e}")
+    
+    def save(self) -> None:
+        if not self.cache_file or not self._results:
+            return
+        
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(tmp_file, "wb") as f:
+            np.savez(
+                f,
+                embeddings=self._embeddings,
+                is_command=np.array([r[0] for r in self._results], dtype=bool),
+                confidence=np.array([r[1] for r in self._results], dtype=np.float32),
+                last_used=self._last_used
+            )
+        os.replace(tmp_file, self.cache_file)
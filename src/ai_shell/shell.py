@@ -1,10 +1,13 @@
 import readline
 import os
 import signal
+import atexit
+import traceback
 import glob
 import asyncio
 import re
 import uuid
+import httpx
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -22,6 +25,32 @@ from src.trace.proxies import LLMProxy, ToolProxy
 from src.trace.events import TraceContext, FileEventSink, TaskEvent
 from src.utils.paths import get_absolute_path
 
+COMPLETER_DELIMS = " \t\n`!@#$%^&*()=+[{]}\\|;:'\",<>?"
+
+# Inputs starting with one of these skip the LLM classifier entirely
+PATH_PREFIXES = ('/', './', '~/', '../')
+SHELL_BUILTINS = frozenset([
+    'cd', 'export', 'alias', 'unalias', 'source', '.', 'pwd', 'echo',
+    'set', 'unset', 'type', 'exec', 'jobs', 'fg', 'bg', 'umask', 'ulimit'
+])
+NL_FIRST_WORDS = frozenset(['what', 'why', 'how', 'explain', 'fix'])
+
+# prompt_toolkit is imported on first use so that modules which only need the
+# shell's executors (e.g. the brain orchestrator) don't pay for it.
+_shell_prompt_cls = None
+
+
+def _load_shell_prompt():
+    """Return the prompt_toolkit-backed ShellPrompt class, or None if unavailable."""
+    global _shell_prompt_cls
+    if _shell_prompt_cls is None:
+        try:
+            from src.ai_shell.prompt import ShellPrompt
+            _shell_prompt_cls = ShellPrompt
+        except ImportError:
+            _shell_prompt_cls = False
+    return _shell_prompt_cls or None
+
 
 class AIShell:
     
@@ -55,16 +84,24 @@ class AIShell:
         
         self.executor = CommandExecutor()
         
+        # One HTTP connection pool shared by every LLM client in the shell
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=8)
+        )
+        
         # Create real clients
-        real_llm_client = LLMClient()
+        real_llm_client = LLMClient(http_client=self.http_client)
         real_tool_executor = AIShellToolExecutor(command_executor=self.executor)
         
         # Create a separate LLM client for the classifier
-        classifier_llm_client = LLMClient(AppSettings.get_llm_config("classifier_llm"))
+        classifier_llm_client = LLMClient(
+            AppSettings.get_llm_config("classifier_llm"),
+            http_client=self.http_client
+        )
         
         # Create personality LLM client
         personality_config = AppSettings.get_llm_config("personality_llm")
-        self.real_personality_llm = LLMClient(personality_config) if personality_config else None
+        self.real_personality_llm = LLMClient(personality_config, http_client=self.http_client) if personality_config else None
         
         # For classifier, we create a simple trace context
         classifier_trace_context = TraceContext(
@@ -87,24 +124,54 @@ class AIShell:
         self.real_llm_client = real_llm_client
         self.real_tool_executor = real_tool_executor
         
+        # Proxies are built once; _ask_ai points them at each task's trace context
+        session_trace_context = TraceContext(
+            trace_id=self.session_id,
+            user_request="AI Shell",
+            start_time=datetime.now()
+        )
+        self._llm_proxy = LLMProxy(self.real_llm_client, session_trace_context, self.event_sink)
+        self._tool_proxy = ToolProxy(self.real_tool_executor, session_trace_context, self.event_sink)
+        self._personality_proxy = LLMProxy(self.real_personality_llm, session_trace_context, self.event_sink) if self.real_personality_llm else None
+        
         # Create a persistent ChatSession that will be reused across requests
         self.persistent_chat_session = ChatSession(
             memory=self.session_memory,
-            llm_client=self.real_llm_client,
-            tool_executor=self.real_tool_executor,
+            llm_client=self._llm_proxy,
+            tool_executor=self._tool_proxy,
             prompt_builder=self.session_prompt_builder,
             thread_id=self.session_id,
             context_mode="none",
-            personality_llm=self.real_personality_llm
+            personality_llm=self._personality_proxy
         )
         
         # Track total tokens like main.py
         self.total_tokens = 0
         
+        # $PATH split into existing directories, refreshed only when $PATH changes
+        self._path_env_snapshot = None
+        self._path_dirs = []
+        self._known_commands = None
+        self._maybe_refresh_path()
+        
         self.running = True
         self.config = ai_shell_config
         
-        self._setup_readline()
+        # All dangerous patterns folded into one alternation, compiled once
+        self._dangerous_re = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in self.config.dangerous_patterns),
+            re.IGNORECASE
+        ) if self.config.dangerous_patterns else None
+        
+        self._prompt = None
+        shell_prompt_cls = _load_shell_prompt()
+        if shell_prompt_cls is not None:
+            self._prompt = shell_prompt_cls(
+                self.config.history_file, self._completion_matches, COMPLETER_DELIMS,
+                max_history=self.config.max_history
+            )
+        else:
+            self._setup_readline()
         self._setup_signals()
     
     def _setup_readline(self):
@@ -113,7 +180,7 @@ class AIShell:
         readline.parse_and_bind("set editing-mode emacs")
         readline.parse_and_bind("set completion-ignore-case on")
         readline.set_completer(self._complete)
-        readline.set_completer_delims(" \t\n`!@#$%^&*()=+[{]}\\|;:'\",<>?")
+        readline.set_completer_delims(COMPLETER_DELIMS)
         
         try:
             readline.read_history_file(str(self.config.history_file))
@@ -121,7 +188,6 @@ class AIShell:
         except FileNotFoundError:
             pass
         
-        import atexit
         atexit.register(self._save_history)
     
     def _save_history(self):
@@ -132,6 +198,14 @@ class AIShell:
             if self.config.debug_mode:
                 print(f"Could not save history: {e}")
     
+    def _dedupe_readline_history(self):
+        
+        # input() has already recorded the line; only drop it when it repeats
+        # the previous entry (get_history_item is 1-based, remove is 0-based)
+        length = readline.get_current_history_length()
+        if length >= 2 and readline.get_history_item(length) == readline.get_history_item(length - 1):
+            readline.remove_history_item(length - 1)
+    
     def _setup_signals(self):
         
         def signal_handler(sig, frame):
@@ -142,39 +216,70 @@ class AIShell:
     
     def _complete(self, text, state):
         
+        matches = self._completion_matches(text)
+        return matches[state] if state < len(matches) else None
+    
+    def _completion_matches(self, text) -> list:
+        
         try:
             if not text:
-                matches = [f for f in os.listdir('.') if not f.startswith('.')]
+                with os.scandir('.') as it:
+                    matches = [entry.name for entry in it if not entry.name.startswith('.')]
             elif text.startswith('/') or text.startswith('./') or text.startswith('~/'):
                 expanded = os.path.expanduser(text)
                 matches = glob.glob(expanded + '*')
                 if text.startswith('./'):
                     matches = [m[2:] if m.startswith('./') else m for m in matches]
             else:
-                matches = []
+                matches = set()
                 
-                for path_dir in os.environ.get('PATH', '').split(':'):
-                    if os.path.isdir(path_dir):
-                        try:
-                            executables = [
-                                f for f in os.listdir(path_dir) 
-                                if f.startswith(text) and 
-                                os.access(os.path.join(path_dir, f), os.X_OK)
-                            ]
-                            matches.extend(executables)
-                        except (PermissionError, OSError):
-                            continue
+                self._maybe_refresh_path()
+                for path_dir in self._path_dirs:
+                    try:
+                        with os.scandir(path_dir) as it:
+                            for entry in it:
+                                if not entry.name.startswith(text):
+                                    continue
+                                try:
+                                    if entry.stat().st_mode & 0o111:
+                                        matches.add(entry.name)
+                                except OSError:
+                                    continue
+                    except OSError:
+                        continue
                 
-                local_files = [f for f in os.listdir('.') if f.startswith(text)]
-                matches.extend(local_files)
+                with os.scandir('.') as it:
+                    matches.update(entry.name for entry in it if entry.name.startswith(text))
                 
-                matches = list(set(matches))
+                matches = list(matches)
             
             matches.sort()
-            return matches[state] if state < len(matches) else None
+            return matches
             
-        except (OSError, IndexError):
-            return None
+        except OSError:
+            return []
+    
+    def _maybe_refresh_path(self):
+        
+        path = os.environ.get('PATH', '')
+        if path != self._path_env_snapshot:
+            self._path_dirs = [d for d in path.split(':') if d and os.path.isdir(d)]
+            self._path_env_snapshot = path
+            self._known_commands = None
+    
+    def _get_known_commands(self) -> set:
+        
+        self._maybe_refresh_path()
+        if self._known_commands is None:
+            commands = set(SHELL_BUILTINS)
+            for path_dir in self._path_dirs:
+                try:
+                    commands.update(os.listdir(path_dir))
+                except OSError:
+                    continue
+            self._known_commands = commands
+        
+        return self._known_commands
     
     def _get_prompt(self):
         
@@ -201,7 +306,8 @@ class AIShell:
         if not user_input:
             return
         
-        readline.add_history(user_input)
+        if self._prompt is None:
+            self._dedupe_readline_history()
         
         if user_input == 'exit':
             self.running = False
@@ -224,7 +330,28 @@ class AIShell:
             return
         
         try:
-            command_history = self.executor.get_recent_history()
+            first_word = user_input.split(None, 1)[0]
+            
+            if first_word.startswith(PATH_PREFIXES) or (
+                first_word in self._get_known_commands()
+                and not self.classifier.is_obvious_natural_language(user_input)
+            ):
+                if self.config.debug_mode:
+                    print("[DEBUG] Classification: fast path -> command")
+                await self._execute_command(user_input)
+                return
+            
+            # Commands can end in a '?' glob (ls data?), so the classifier's
+            # command check still comes first, as it does in classify()
+            if (user_input.endswith('?') or first_word.lower() in NL_FIRST_WORDS) and (
+                not self.classifier.is_obvious_command(user_input)
+            ):
+                if self.config.debug_mode:
+                    print("[DEBUG] Classification: fast path -> natural language")
+                await self._ask_ai(user_input)
+                return
+            
+            command_history = self.executor.get_recent_history(max(10, self.config.context_commands))
             is_command, confidence = await self.classifier.classify(user_input, command_history)
             
             if self.config.debug_mode:
@@ -233,12 +360,11 @@ class AIShell:
             if is_command:
                 await self._execute_command(user_input)
             else:
-                await self._ask_ai(user_input)
+                await self._ask_ai(user_input, command_history)
                 
         except Exception as e:
             print(f"❌ Error processing input: {e}")
             if self.config.debug_mode:
-                import traceback
                 traceback.print_exc()
     
     async def _execute_command(self, command: str):
@@ -255,18 +381,22 @@ class AIShell:
                 self.executor.execute_command, command
             )
             
+            # Stateful commands (export, source, ...) may have changed $PATH
+            if self.executor.is_stateful_command(command):
+                self._maybe_refresh_path()
+            
             if output and output.strip():
                 print(output)
             
             if exit_code != 0 and self.config.enable_suggestions:
-                recent_error = self.executor.get_recent_history(1)[0]
+                recent_error = self.executor.get_last_entry()
                 if recent_error and recent_error['exit_code'] != 0:
                     print(f"\n💡 Command failed. Type 'fix' or 'what went wrong?' for help.")
                     
         except Exception as e:
             print(f"❌ Command execution failed: {e}")
     
-    async def _ask_ai(self, prompt: str):
+    async def _ask_ai(self, prompt: str, command_history: Optional[list] = None):
         
         # Create a new trace_id for this task (like main.py does)
         task_trace_id = str(uuid.uuid4())
@@ -285,7 +415,7 @@ class AIShell:
         ))
         
         try:
-            context = self._build_context_from_history()
+            context = self._build_context_from_history(command_history)
             
             if context:
                 full_prompt = f"{prompt}\n\nContext:\n{context}"
@@ -299,29 +429,15 @@ class AIShell:
                 start_time=task_start_time
             )
             
-            # Create proxied clients for this request
-            llm_proxy = LLMProxy(self.real_llm_client, trace_context, self.event_sink)
-            tool_proxy = ToolProxy(self.real_tool_executor, trace_context, self.event_sink)
-            personality_proxy = LLMProxy(self.real_personality_llm, trace_context, self.event_sink) if self.real_personality_llm else None
-            
-            # Update the persistent chat session's clients with the proxied versions for tracing
-            # Save the original clients first
-            original_llm = self.persistent_chat_session.agent.llm_client
-            original_tool = self.persistent_chat_session.agent.tool_executor
-            original_personality = self.persistent_chat_session.agent.personality_llm
-            
-            # Temporarily swap in the proxied clients
-            self.persistent_chat_session.agent.llm_client = llm_proxy
-            self.persistent_chat_session.agent.tool_executor = tool_proxy
-            self.persistent_chat_session.agent.personality_llm = personality_proxy
+            # Route this request's LLM and tool events to its own trace
+            self._llm_proxy.trace_context = trace_context
+            self._tool_proxy.trace_context = trace_context
+            if self._personality_proxy:
+                self._personality_proxy.trace_context = trace_context
             
             # Use the persistent session
             response, tokens_used = await self.persistent_chat_session.ask(full_prompt)
             
-            # Restore the original clients
-            self.persistent_chat_session.agent.llm_client = original_llm
-            self.persistent_chat_session.agent.tool_executor = original_tool
-            self.persistent_chat_session.agent.personality_llm = original_personality
             self.total_tokens += tokens_used
             
             print(f"\n🤖 {response}")
@@ -355,12 +471,14 @@ class AIShell:
             ))
             print(f"❌ AI request failed: {e}")
             if self.config.debug_mode:
-                import traceback
                 traceback.print_exc()
     
-    def _build_context_from_history(self) -> str:
+    def _build_context_from_history(self, command_history: Optional[list] = None) -> str:
         
-        recent_history = self.executor.get_recent_history(self.config.context_commands)
+        # Reuse the history the caller already fetched instead of re-querying
+        if command_history is None:
+            command_history = self.executor.get_recent_history(self.config.context_commands)
+        recent_history = command_history[-self.config.context_commands:]
         
         if not recent_history:
             return f"Current directory: {self.executor.get_current_directory()}"
@@ -387,11 +505,7 @@ class AIShell:
         if not self.config.dangerous_commands_require_confirmation:
             return False
         
-        for pattern in self.config.dangerous_patterns:
-            if re.search(pattern, command, re.IGNORECASE):
-                return True
-        
-        return False
+        return self._dangerous_re is not None and self._dangerous_re.search(command) is not None
     
     def _show_history(self):
         
@@ -475,7 +589,6 @@ Tips:
         except Exception as e:
             print(f"❌ Self-enhancement failed: {e}")
             if self.config.debug_mode:
-                import traceback
                 traceback.print_exc()
     
     async def _handle_brain_session_command(self, user_input: str):
@@ -542,14 +655,16 @@ Tips:
         except Exception as e:
             print(f"❌ Error in brain session: {e}")
             if self.config.debug_mode:
-                import traceback
                 traceback.print_exc()
     
     async def run(self):
         
         while self.running:
             try:
-                user_input = await asyncio.to_thread(input, self._get_prompt())
+                if self._prompt is not None:
+                    user_input = await self._prompt.read(self._get_prompt())
+                else:
+                    user_input = await asyncio.to_thread(input, self._get_prompt())
                 await self._process_input(user_input)
                 
             except EOFError:
@@ -561,10 +676,12 @@ Tips:
             except Exception as e:
                 print(f"❌ Unexpected error: {e}")
                 if self.config.debug_mode:
-                    import traceback
                     traceback.print_exc()
         
         self.executor.cleanup()
+        self.classifier.save_cache()
+        await self.http_client.aclose()
+        self.event_sink.close()
         print("✨ AI Shell session ended.")
 
 
@@ -1,23 +1,90 @@
 import asyncio
+import collections
+import functools
+import hashlib
+import itertools
+import json
+import os
+import re
 import uuid
-import yaml
+import weakref
+import httpx
 import sys
-import threading
 import time
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 
 from src.agent.session import ChatSession
 from src.agent.memory import InMemoryMemory, Message
 from src.agent.prompt_builder import PromptBuilder
-from src.llm.client import LLMClient
+from src.llm.client import LLMClient, strict_json_schema
+from src.llm.cache import CachingLLMClient
+from src.llm.types import LLMConfig
 from src.ai_shell.ai_tool_executor import AIShellToolExecutor
 from src.ai_shell.executor import CommandExecutor
 from src.config.settings import AppSettings
 from src.trace.proxies import LLMProxy, ToolProxy
-from src.trace.events import TraceContext, FileEventSink, TaskEvent
+from src.trace.events import TraceContext, AsyncFileEventSink, TaskEvent
 from src.utils.paths import get_absolute_path
+from src.utils.rate_limit import AsyncRateLimiter
+from src.utils.yaml_loader import safe_load
+
+
+# Keywords in a brain decision that end the session, matched in a single pass
+_STOP_RE = re.compile(r'complete|finished|done|success|accomplished', re.IGNORECASE)
+
+MAX_KEY_FINDINGS = 200
+
+MAX_INFLIGHT_LLM = int(os.environ.get("AIDA_MAX_INFLIGHT_LLM", "32"))
+
+# Worker reports longer than this are cut down, keeping their start and end,
+# before they go into the Brain's notes prompt
+MAX_NOTES_CHARS = 8192
+
+_REPORT_FOOTER = f"\n\n{'=' * 60}\nSession completed successfully!"
+
+# Independent subtasks a decision lists under a "PARALLEL:" line are handed
+# to a small pool of worker sessions at once
+MAX_PARALLEL_WORKERS = 3
+_PARALLEL_RE = re.compile(r'^\s*PARALLEL:', re.IGNORECASE | re.MULTILINE)
+_LIST_ITEM_RE = re.compile(r'^\s*(?:[-*•]|\d+[.)])\s+(.+?)\s*$')
+
+
+def load_prompts() -> dict:
+    """Return the parsed prompts.yaml, memoized for as long as the file is unchanged."""
+    path = get_absolute_path("prompts.yaml")
+    stat = os.stat(path)
+    return _load_prompts_cached(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_prompts_cached(path: str, mtime_ns: int, size: int) -> dict:
+    # The parsed YAML is kept as JSON in tmp/, keyed by a hash of the source,
+    # so an edited file can never be served a stale copy; json.load is much
+    # faster than YAML parsing on later runs.
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    sidecar = get_absolute_path("tmp") / f"prompts.{digest}.json"
+    try:
+        with open(sidecar, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    
+    prompts = safe_load(raw) or {}
+    
+    tmp_file = f"{sidecar}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(sidecar.parent, exist_ok=True)
+        with open(tmp_file, 'w') as f:
+            json.dump(prompts, f)
+        os.replace(tmp_file, sidecar)
+    except (OSError, TypeError):
+        pass
+    
+    return prompts
 
 
 class ExtractionStep(BaseModel):
@@ -36,44 +103,74 @@ class ServiceInfo(BaseModel):
         title = "ServiceInfo"
 
 
-class TargetStateExtraction(BaseModel):
-    steps: List[ExtractionStep]
+class BrainNotes(BaseModel):
+    """The Brain's notes on a worker result together with the target state found in it"""
+    notes: str
     open_ports: List[int]
     services: List[ServiceInfo]
     vulnerabilities: List[str]
     key_findings: List[str]
     
     class Config:
-        title = "TargetStateExtraction"
+        title = "BrainNotes"
 
 
-class Spinner:
+class DebugBrainNotes(BrainNotes):
+    steps: List[ExtractionStep]
+    
+    class Config:
+        title = "DebugBrainNotes"
+
+
+# Structured-output schemas are built once rather than on every notes call
+_BRAIN_NOTES_SCHEMA = strict_json_schema(BrainNotes)
+_DEBUG_BRAIN_NOTES_SCHEMA = strict_json_schema(DebugBrainNotes)
+
+
+class AsyncSpinner:
+    """Terminal spinner driven by an asyncio task, used as `async with AsyncSpinner(msg):`"""
+    
+    spinner_chars = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
+    
+    __slots__ = ("message", "running", "task")
+    
     def __init__(self, message: str):
         self.message = message
         self.running = False
-        self.thread = None
-        self.spinner_chars = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
+        self.task = None
     
-    def _spin(self):
+    async def _spin(self):
         idx = 0
         while self.running:
             sys.stdout.write(f'\r{self.spinner_chars[idx]} {self.message}')
             sys.stdout.flush()
             idx = (idx + 1) % len(self.spinner_chars)
-            time.sleep(0.1)
-        sys.stdout.write('\r' + ' ' * (len(self.message) + 3) + '\r')
-        sys.stdout.flush()
+            await asyncio.sleep(0.1)
     
-    def start(self):
+    def start(self) -> asyncio.Task:
         self.running = True
-        self.thread = threading.Thread(target=self._spin)
-        self.thread.daemon = True
-        self.thread.start()
+        self.task = asyncio.create_task(self._spin())
+        return self.task
     
-    def stop(self):
+    async def stop(self):
         self.running = False
-        if self.thread:
-            self.thread.join()
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        sys.stdout.write('\r' + ' ' * (len(self.message) + 3) + '\r')
+        sys.stdout.flush()
+    
+    async def __aenter__(self):
+        self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+        return False
 
 
 class BrainOrchestrator:
@@ -81,7 +178,23 @@ class BrainOrchestrator:
     Orchestrates the Brain-Worker agent interaction for autonomous penetration testing
     """
     
-    def __init__(self, target: str, goal: str, brain_prompt: str, max_iterations: int = 50):
+    # In-flight LLM calls are capped across every orchestrator sharing an
+    # event loop (e.g. a server running several sessions); asyncio primitives
+    # are loop-bound, so there is one semaphore per loop
+    _llm_sems: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+    
+    __slots__ = (
+        "target", "goal", "brain_prompt", "max_iterations", "iteration_count", "prompts",
+        "session_id", "brain_thread_id", "worker_thread_id", "event_sink", "report_file",
+        "target_state", "_open_ports", "_ports_csv", "_services_csv", "_vulns_seen",
+        "_findings_seen", "_context_header", "_report_header", "verbose", "debug_extraction",
+        "_state_context", "_state_dirty", "_ts_second", "_ts_cached", "_rate_limiter",
+        "command_executor", "http_client", "_llm_cache_dir", "_llm_caches", "extraction_llm", "brain_session",
+        "_worker_session", "worker_pool", "_idle_workers", "_pool_executors"
+    )
+    
+    def __init__(self, target: str, goal: str, brain_prompt: str, max_iterations: int = 50,
+                 verbose: Optional[bool] = None):
         self.target = target
         self.goal = goal
         self.brain_prompt = brain_prompt
@@ -99,10 +212,9 @@ class BrainOrchestrator:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         tmp_dir = get_absolute_path("tmp")
         trace_file = str(tmp_dir / f"brain_trace_{timestamp}.jsonl")
-        self.event_sink = FileEventSink(trace_file)
-        
-        self.target = target
-        self.goal = goal
+        self.event_sink = AsyncFileEventSink(trace_file)
+        # The final report is written next to the trace rather than into it
+        self.report_file = str(tmp_dir / f"brain_report_{timestamp}.md")
         
         self.target_state = {
             "target_ip": target,
@@ -110,53 +222,117 @@ class BrainOrchestrator:
             "open_ports": [],
             "services": {},
             "vulnerabilities": [],
-            "key_findings": []
+            # Bounded: only the most recent findings are ever shown to the Brain
+            "key_findings": collections.deque(maxlen=MAX_KEY_FINDINGS)
         }
         
+        # Ports are tracked in a set; the sorted list in target_state is only
+        # rebuilt when a new port shows up, as are the pre-formatted strings
+        # the state context is rendered from
+        self._open_ports = set()
+        self._ports_csv = ""
+        self._services_csv = ""
+        # Shadow sets for O(1) dedupe; the lists in target_state keep their
+        # insertion order
+        self._vulns_seen = set()
+        self._findings_seen = set()
+        
+        self._context_header = f"Target: {target}\nGoal: {goal}"
+        self._report_header = f"🧠 BRAIN SESSION REPORT\n{'=' * 60}\nTarget: {target}\nGoal: {goal}\n"
+        
+        # Full contexts, decisions, worker output and notes are only printed in
+        # verbose mode; otherwise each iteration gets a one-line summary and the
+        # full content lives in the trace file
+        self.verbose = AppSettings.BRAIN_DETAILED_LOGGING if verbose is None else verbose
+        # Chain-of-thought extraction steps roughly double the extraction
+        # output tokens, so they are only requested when debugging
+        self.debug_extraction = AppSettings.BRAIN_DEBUG_EXTRACTION
+        self._state_context = ""
+        self._state_dirty = True
+        self._ts_second = None
+        self._ts_cached = ""
+        
+        # Paces brain decisions and worker tasks against the provider's rate
+        # limits; a no-op while the session stays under budget
+        self._rate_limiter = AsyncRateLimiter(AppSettings.BRAIN_MAX_CALLS_PER_MINUTE, 60)
+        
         # Initialize agents
-        self._setup_agents()
+        self._worker_session = None
+        self.worker_pool = []
+        self._idle_workers = None
+        self._pool_executors = []
+        self._setup_brain()
     
-    def _timestamp(self) -> str:
-        return datetime.now().strftime("%H:%M:%S")
+    @classmethod
+    def _llm_sem(cls) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = cls._llm_sems.get(loop)
+        if sem is None:
+            sem = cls._llm_sems[loop] = asyncio.Semaphore(MAX_INFLIGHT_LLM)
+        return sem
+    
+    @classmethod
+    async def create(cls, target: str, goal: str, brain_prompt: str, max_iterations: int = 50,
+                     verbose: Optional[bool] = None) -> 'BrainOrchestrator':
+        """Construct the orchestrator in a worker thread so prompt loading and
+        agent setup don't block the running event loop"""
+        return await asyncio.to_thread(cls, target, goal, brain_prompt, max_iterations, verbose)
+    
+    @staticmethod
+    def _print_block(lines: List[str]) -> None:
+        # One write and flush per output section instead of one per line
+        sys.stdout.write('\n'.join(lines) + '\n')
+        sys.stdout.flush()
+    
+    def _timestamp(self, now: Optional[datetime] = None) -> str:
+        if now is not None:
+            return now.strftime("%H:%M:%S")
+        # Timestamps have one-second resolution, so the formatted string is
+        # reused until the second changes
+        second = int(time.time())
+        if second != self._ts_second:
+            self._ts_second = second
+            self._ts_cached = time.strftime("%H:%M:%S", time.localtime(second))
+        return self._ts_cached
     
     def _load_prompts(self) -> dict:
         try:
-            with open(get_absolute_path("prompts.yaml"), 'r') as f:
-                return yaml.safe_load(f)
+            return load_prompts()
         except Exception as e:
             print(f"Warning: Failed to load prompts.yaml: {e}")
             return {}
     
-    def _setup_agents(self):
-        """Initialize Brain and Worker agents"""
-        # Create command executor for worker
+    def _setup_brain(self):
+        """Initialize the Brain agent; the Worker is built on first use"""
+        # The command executor is needed up front: its working directory is
+        # part of every brain context
         self.command_executor = CommandExecutor()
         
-        # Create LLM clients
-        brain_llm = LLMClient(AppSettings.get_llm_config("brain_llm"))
-        worker_llm = LLMClient(AppSettings.get_llm_config("worker_llm"))
+        # Brain, worker and extraction clients share one connection pool, so
+        # calls to the same provider reuse keep-alive connections
+        self.http_client = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=8))
         
-        # Create tool executor for worker
-        worker_tool_executor = AIShellToolExecutor(command_executor=self.command_executor)
+        # Responses from deterministic LLM configs are cached so repeated
+        # identical requests skip the round-trip; brain.llm_cache extends
+        # this to sampled configs
+        self._llm_cache_dir = str(get_absolute_path("tmp") / "llm_cache")
+        self._llm_caches = []
+        brain_llm = self._caching_client(AppSettings.get_llm_config("brain_llm"))
         
-        # Create trace contexts
         brain_trace_context = TraceContext(
             trace_id=self.session_id,
             user_request=f"Brain Session: {self.goal}",
             start_time=datetime.now()
         )
+        brain_llm_proxy = LLMProxy(brain_llm, brain_trace_context, self.event_sink)
         
-        worker_trace_context = TraceContext(
-            trace_id=self.session_id,
-            user_request=f"Worker for Brain Session: {self.goal}",
-            start_time=datetime.now()
+        # The Brain's structured notes calls bypass the response cache, which
+        # only covers plain completions, but are traced like its other calls
+        self.extraction_llm = LLMProxy(
+            LLMClient(AppSettings.get_llm_config("brain_llm"), http_client=self.http_client),
+            brain_trace_context, self.event_sink
         )
         
-        # Create proxied clients
-        brain_llm_proxy = LLMProxy(brain_llm, brain_trace_context, self.event_sink)
-        worker_llm_proxy = LLMProxy(worker_llm, worker_trace_context, self.event_sink)
-        worker_tool_proxy = ToolProxy(worker_tool_executor, worker_trace_context, self.event_sink)
-        
         # Create Brain Agent (strategy only, no tools)
         brain_memory = InMemoryMemory()
         brain_prompt_builder = PromptBuilder(context_mode="none")
@@ -170,11 +346,41 @@ class BrainOrchestrator:
             context_mode="none"
         )
         
+        # Initialize brain with custom prompt and target info
+        self._initialize_brain()
+    
+    def _caching_client(self, config: LLMConfig) -> CachingLLMClient:
+        client = CachingLLMClient(
+            LLMClient(config, http_client=self.http_client),
+            self.event_sink, self.session_id, self._llm_cache_dir,
+            cache_sampled=AppSettings.BRAIN_LLM_CACHE
+        )
+        self._llm_caches.append(client)
+        return client
+    
+    def _ensure_worker(self) -> ChatSession:
+        if self._worker_session is None:
+            self._setup_worker()
+        return self._worker_session
+    
+    def _setup_worker(self):
+        """Initialize the Worker agent and its session pool"""
+        worker_llm = self._caching_client(AppSettings.get_llm_config("worker_llm"))
+        worker_tool_executor = AIShellToolExecutor(command_executor=self.command_executor)
+        
+        worker_trace_context = TraceContext(
+            trace_id=self.session_id,
+            user_request=f"Worker for Brain Session: {self.goal}",
+            start_time=datetime.now()
+        )
+        worker_llm_proxy = LLMProxy(worker_llm, worker_trace_context, self.event_sink)
+        worker_tool_proxy = ToolProxy(worker_tool_executor, worker_trace_context, self.event_sink)
+        
         # Create Worker Agent (execution)
         worker_memory = InMemoryMemory()
         worker_prompt_builder = PromptBuilder(context_mode="none")
         
-        self.worker_session = ChatSession(
+        self._worker_session = ChatSession(
             memory=worker_memory,
             llm_client=worker_llm_proxy,
             tool_executor=worker_tool_proxy,
@@ -183,8 +389,29 @@ class BrainOrchestrator:
             context_mode="none"
         )
         
-        # Initialize brain with custom prompt and target info
-        self._initialize_brain()
+        # Extra worker sessions for parallel subtasks; single tasks always go
+        # to the primary session so its conversation stays continuous. Each
+        # has its own command executor, so shell state such as the working
+        # directory can't leak between subtasks running side by side
+        self.worker_pool = [self._worker_session]
+        for _ in range(MAX_PARALLEL_WORKERS - 1):
+            command_executor = CommandExecutor()
+            self._pool_executors.append(command_executor)
+            tool_executor = AIShellToolExecutor(
+                command_executor=command_executor,
+                commands=worker_tool_executor.commands
+            )
+            self.worker_pool.append(ChatSession(
+                memory=InMemoryMemory(),
+                llm_client=worker_llm_proxy,
+                tool_executor=ToolProxy(tool_executor, worker_trace_context, self.event_sink),
+                prompt_builder=PromptBuilder(context_mode="none"),
+                thread_id=str(uuid.uuid4()),
+                context_mode="none"
+            ))
+        self._idle_workers = asyncio.Queue()
+        for session in self.worker_pool:
+            self._idle_workers.put_nowait(session)
     
     def _initialize_brain(self):
         """Initialize the brain agent with target information and custom prompt"""
@@ -198,26 +425,33 @@ class BrainOrchestrator:
         
         self.brain_session.memory.append(
             self.brain_thread_id,
-            Message(role="system", content=initialization_message)
+            Message(role="system", content=initialization_message, meta={"cache_hint": True})
         )
     
     async def run(self) -> str:
         """Run the autonomous brain session"""
-        print(f"[{self._timestamp()}] 🧠 Starting Brain Session")
-        print(f"[{self._timestamp()}] 🎯 Target: {self.target}")
-        print(f"[{self._timestamp()}] 🎯 Goal: {self.goal}")
-        print(f"[{self._timestamp()}] 📝 Max iterations: {self.max_iterations}")
-        print("=" * 60)
+        # One clock reading serves the whole start banner and its event
+        started = datetime.now()
+        ts = self._timestamp(started)
+        self._print_block([
+            f"[{ts}] 🧠 Starting Brain Session",
+            f"[{ts}] 🎯 Target: {self.target}",
+            f"[{ts}] 🎯 Goal: {self.goal}",
+            f"[{ts}] 📝 Max iterations: {self.max_iterations}",
+            "=" * 60
+        ])
         
         # Emit session start event
         self.event_sink.emit(TaskEvent(
             event_type="brain_session_started",
             trace_id=self.session_id,
-            timestamp=datetime.now(),
+            timestamp=started,
             data={
                 "target": self.target,
                 "goal": self.goal,
-                "max_iterations": self.max_iterations
+                "max_iterations": self.max_iterations,
+                # Recorded so a fallback from uvloop to the default loop shows up in traces
+                "event_loop": type(asyncio.get_running_loop()).__name__
             }
         ))
         
@@ -226,30 +460,36 @@ class BrainOrchestrator:
             while self.iteration_count < self.max_iterations:
                 self.iteration_count += 1
                 
-                print(f"\n{'='*80}")
-                print(f"[{self._timestamp()}] 🔄 ITERATION {self.iteration_count}/{self.max_iterations}")
-                print(f"{'='*80}")
-                
                 # 1. Brain decides next action
-                print(f"\n[{self._timestamp()}] 🧠 BRAIN THINKING...")
-                print(f"[{self._timestamp()}] 📊 Iteration: {self.iteration_count}/{self.max_iterations}")
-                
                 brain_context = self._build_brain_context()
-                print(f"\n[{self._timestamp()}] 🧠 BRAIN CONTEXT:\n{brain_context}")
+                if self.verbose:
+                    ts = self._timestamp()
+                    self._print_block([
+                        f"\n{'='*80}",
+                        f"[{ts}] 🔄 ITERATION {self.iteration_count}/{self.max_iterations}",
+                        f"{'='*80}",
+                        f"\n[{ts}] 🧠 BRAIN THINKING...",
+                        f"[{ts}] 📊 Iteration: {self.iteration_count}/{self.max_iterations}",
+                        f"\n[{ts}] 🧠 BRAIN CONTEXT:\n{brain_context}"
+                    ])
                 
-                spinner = Spinner("Brain analyzing target state and deciding next action...")
-                spinner.start()
-                brain_decision = await self._get_brain_decision()
-                spinner.stop()
+                async with AsyncSpinner("Brain analyzing target state and deciding next action..."):
+                    brain_decision = await self._get_brain_decision(brain_context)
                 
                 if not brain_decision:
                     print(f"[{self._timestamp()}] ❌ Brain failed to make a decision. Stopping.")
                     break
                 
-                print(f"\n[{self._timestamp()}] 🧠 BRAIN DECISION:")
-                print(f"{'─'*80}")
-                print(f"{brain_decision}")
-                print(f"{'─'*80}")
+                if self.verbose:
+                    self._print_block([
+                        f"\n[{self._timestamp()}] 🧠 BRAIN DECISION:",
+                        f"{'─'*80}",
+                        brain_decision,
+                        f"{'─'*80}"
+                    ])
+                else:
+                    summary = brain_decision.strip().split('\n', 1)[0][:100]
+                    print(f"[{self._timestamp()}] 🔄 {self.iteration_count}/{self.max_iterations} 🧠 {summary}")
                 
                 # 2. Check if brain wants to stop
                 if self._should_stop(brain_decision):
@@ -257,60 +497,30 @@ class BrainOrchestrator:
                     break
                 
                 # 3. Worker executes the task
-                print(f"\n[{self._timestamp()}] 🔧 WORKER EXECUTING TASK...")
-                
-                spinner = Spinner(f"Worker executing: {brain_decision[:60]}...")
-                spinner.start()
-                worker_result = await self._execute_worker_task(brain_decision)
-                spinner.stop()
-                
-                print(f"\n[{self._timestamp()}] 🔧 WORKER RESULT:")
-                print(f"{'─'*80}")
-                print(f"{worker_result}")
-                print(f"{'─'*80}")
-                
-                # 4. Brain takes notes
-                print(f"\n[{self._timestamp()}] 📝 BRAIN TAKING NOTES...")
-                
-                spinner = Spinner("Brain analyzing results and taking notes...")
-                spinner.start()
-                notes = await self._ask_brain_for_notes(brain_decision, worker_result)
-                spinner.stop()
-                
-                print(f"[{self._timestamp()}] Notes:\n{notes}")
+                if self.verbose:
+                    print(f"\n[{self._timestamp()}] 🔧 WORKER EXECUTING TASK...")
                 
-                # 5. Extract structured data from notes (LLM with temp 0.1)
-                print(f"\n[{self._timestamp()}] 🔍 EXTRACTING STRUCTURED DATA...")
+                async with AsyncSpinner(f"Worker executing: {brain_decision[:60]}..."):
+                    worker_result = await self._execute_worker_tasks(brain_decision)
                 
-                spinner = Spinner("Extracting structured data with chain-of-thought reasoning...")
-                spinner.start()
-                extracted = await self._extract_state_from_notes(notes)
-                spinner.stop()
+                if self.verbose:
+                    # 4. Brain takes notes
+                    ts = self._timestamp()
+                    self._print_block([
+                        f"\n[{ts}] 🔧 WORKER RESULT:",
+                        f"{'─'*80}",
+                        f"{worker_result}",
+                        f"{'─'*80}",
+                        f"\n[{ts}] 📝 BRAIN TAKING NOTES..."
+                    ])
                 
-                print(f"[{self._timestamp()}]   Extracted ports: {extracted['open_ports']}")
-                print(f"[{self._timestamp()}]   Extracted services: {list(extracted['services'].keys()) if extracted['services'] else []}")
-                print(f"[{self._timestamp()}]   Extracted vulnerabilities: {len(extracted['vulnerabilities'])} items")
-                print(f"[{self._timestamp()}]   Extracted findings: {len(extracted['key_findings'])} items")
+                async with AsyncSpinner("Brain analyzing results and taking notes..."):
+                    notes, extracted = await self._ask_brain_for_structured_notes(worker_result)
                 
-                # 6. Update target state
-                self._update_target_state(extracted)
-                
-                # 7. Remove notes conversation from Brain's history (save context)
-                self.brain_session.memory.remove_last_exchange(self.brain_thread_id)
-                
-                # 8. Show updated state
-                print(f"\n[{self._timestamp()}] 📊 UPDATED STATE:")
-                if self.target_state['open_ports']:
-                    print(f"[{self._timestamp()}]   Open Ports: {self.target_state['open_ports']}")
-                if self.target_state['services']:
-                    print(f"[{self._timestamp()}]   Services: {self.target_state['services']}")
-                if self.target_state['vulnerabilities']:
-                    print(f"[{self._timestamp()}]   Vulnerabilities: {len(self.target_state['vulnerabilities'])} found")
-                if self.target_state['key_findings']:
-                    print(f"[{self._timestamp()}]   Key Findings: {len(self.target_state['key_findings'])} items")
-                
-                # 9. Brief pause to prevent overwhelming
-                await asyncio.sleep(1)
+                # 5. The notes come back with the structured state already extracted
+                if self.verbose:
+                    print(f"[{self._timestamp()}] Notes:\n{notes}")
+                self._apply_extraction(extracted)
             
             # Print session history
             self._print_session_history()
@@ -318,10 +528,10 @@ class BrainOrchestrator:
             # Generate final report
             print(f"\n[{self._timestamp()}] 🤖 Generating final report...")
             
-            spinner = Spinner("Generating final penetration testing report...")
-            spinner.start()
-            final_report = await self._generate_final_report()
-            spinner.stop()
+            async with AsyncSpinner("Generating final penetration testing report..."):
+                final_report = await self._generate_final_report()
+            
+            await asyncio.to_thread(self._write_report, final_report)
             
             # Emit session end event
             self.event_sink.emit(TaskEvent(
@@ -330,10 +540,14 @@ class BrainOrchestrator:
                 timestamp=datetime.now(),
                 data={
                     "iterations": self.iteration_count,
-                    "target_state": self.target_state,
-                    "final_report": final_report
+                    "target_state": {
+                        **self.target_state,
+                        "key_findings": list(self.target_state["key_findings"])
+                    },
+                    "report_file": self.report_file
                 }
             ))
+            await self.event_sink.flush()
             
             return final_report
             
@@ -345,12 +559,48 @@ class BrainOrchestrator:
                 timestamp=datetime.now(),
                 data={"error": error_msg}
             ))
+            await self.event_sink.flush()
             return error_msg
+        finally:
+            await self.http_client.aclose()
+            for client in self._llm_caches:
+                client.close()
+            for command_executor in self._pool_executors:
+                command_executor.cleanup()
+    
+    def _apply_extraction(self, extracted: dict) -> None:
+        """Fold the state extracted alongside the Brain's notes into target_state"""
+        self._update_target_state(extracted)
+        
+        ts = self._timestamp()
+        if not self.verbose:
+            print(
+                f"[{ts}]   📊 ports: {len(self.target_state['open_ports'])}, "
+                f"services: {len(self.target_state['services'])}, "
+                f"vulnerabilities: {len(self.target_state['vulnerabilities'])}, "
+                f"findings: {len(self.target_state['key_findings'])}"
+            )
+            return
+        
+        lines = [
+            f"[{ts}]   Extracted ports: {extracted['open_ports']}",
+            f"[{ts}]   Extracted services: {list(extracted['services'].keys()) if extracted['services'] else []}",
+            f"[{ts}]   Extracted vulnerabilities: {len(extracted['vulnerabilities'])} items",
+            f"[{ts}]   Extracted findings: {len(extracted['key_findings'])} items",
+            f"\n[{ts}] 📊 UPDATED STATE:"
+        ]
+        if self.target_state['open_ports']:
+            lines.append(f"[{ts}]   Open Ports: {self.target_state['open_ports']}")
+        if self.target_state['services']:
+            lines.append(f"[{ts}]   Services: {self.target_state['services']}")
+        if self.target_state['vulnerabilities']:
+            lines.append(f"[{ts}]   Vulnerabilities: {len(self.target_state['vulnerabilities'])} found")
+        if self.target_state['key_findings']:
+            lines.append(f"[{ts}]   Key Findings: {len(self.target_state['key_findings'])} items")
+        self._print_block(lines)
     
-    async def _get_brain_decision(self) -> str:
+    async def _get_brain_decision(self, context: str) -> str:
         """Get the next decision from the brain agent"""
-        context = self._build_brain_context()
-        
         decision_template = self.prompts.get("brain_agent_decision", "Based on the current target state, decide the next action.\n\nCURRENT STATE:\n{context}\n\nProvide a specific task for the worker to execute. Be direct and actionable.\nExamples:\n- \"Run nmap scan on {target}\"\n- \"Check HTTP service on port 80 for vulnerabilities\"\n- \"Try default credentials on admin panel\"\n- \"COMPLETE: Successfully gained access to target\"\n\nYour decision:")
         
         brain_prompt = decision_template.format(
@@ -359,85 +609,92 @@ class BrainOrchestrator:
         )
         
         try:
-            response, _ = await self.brain_session.ask(brain_prompt)
+            async with self._rate_limiter, self._llm_sem():
+                response, _ = await self.brain_session.ask(brain_prompt)
             return response.strip()
         except Exception as e:
             print(f"[{self._timestamp()}] ❌ Brain decision error: {e}")
             return ""
     
-    async def _execute_worker_task(self, task: str) -> str:
+    def _split_parallelizable(self, brain_decision: str) -> List[str]:
+        """Return the independent subtasks listed after a PARALLEL: marker, or the whole decision"""
+        marker = _PARALLEL_RE.search(brain_decision)
+        if not marker:
+            return [brain_decision]
+        
+        tasks = []
+        for line in brain_decision[marker.end():].splitlines():
+            item = _LIST_ITEM_RE.match(line)
+            if item:
+                tasks.append(item.group(1).strip('"'))
+            elif tasks and line.strip():
+                break
+        return tasks or [brain_decision]
+    
+    async def _execute_worker_tasks(self, brain_decision: str) -> str:
+        tasks = self._split_parallelizable(brain_decision)
+        if len(tasks) == 1:
+            return await self._execute_worker_task(tasks[0])
+        
+        print(f"[{self._timestamp()}] 🔀 Running {len(tasks)} subtasks in parallel")
+        results = await asyncio.gather(*(self._execute_pooled_worker_task(task) for task in tasks))
+        return '\n\n'.join(
+            f"[Subtask {i}] {task}\n{result}"
+            for i, (task, result) in enumerate(zip(tasks, results), 1)
+        )
+    
+    async def _execute_pooled_worker_task(self, task: str) -> str:
+        # The idle queue holds MAX_PARALLEL_WORKERS sessions, which also caps
+        # how many worker LLM calls are in flight at once
+        self._ensure_worker()
+        session = await self._idle_workers.get()
+        try:
+            return await self._execute_worker_task(task, session)
+        finally:
+            self._idle_workers.put_nowait(session)
+    
+    async def _execute_worker_task(self, task: str, session: ChatSession = None) -> str:
         """Have the worker execute the given task"""
         worker_template = self.prompts.get("worker_agent_task", "Execute this specific task: {task}\n\nUse the appropriate tools to complete this task. Be thorough and report back with detailed results.")
         
         worker_prompt = worker_template.format(task=task)
         
         try:
-            response, _ = await self.worker_session.ask(worker_prompt)
+            async with self._rate_limiter, self._llm_sem():
+                response, _ = await (session or self._ensure_worker()).ask(worker_prompt)
             return response
         except Exception as e:
             return f"Worker execution error: {str(e)}"
     
-    async def _ask_brain_for_notes(self, task: str, result: str) -> str:
-        notes_prompt = f"""You asked Worker to: {task}
-Worker reported: {result}
-
-Update your notes with key findings. Extract:
-- Open ports (if any)
-- Services and versions (if any)  
-- Vulnerabilities or issues found (if any)
-- Important discoveries (credentials, endpoints, etc.)
-
-Write concise technical notes about what was discovered."""
-
-        try:
-            notes, _ = await self.brain_session.ask(notes_prompt)
-            return notes.strip()
-        except Exception as e:
-            print(f"[{self._timestamp()}] ❌ Brain notes error: {e}")
-            return ""
-    
-    def _build_brain_context(self) -> str:
-        current_dir = self.command_executor.get_current_directory()
-        
-        parts = [
-            f"Target: {self.target_state['target_ip']}",
-            f"Goal: {self.target_state['goal']}",
-            f"Working Directory: {current_dir}",
-            f"Iteration: {self.iteration_count}/{self.max_iterations}"
-        ]
-        
-        if self.target_state['open_ports']:
-            parts.append(f"Open Ports: {', '.join(map(str, self.target_state['open_ports']))}")
-        
-        if self.target_state['services']:
-            services = ', '.join([f"{port}:{svc}" for port, svc in self.target_state['services'].items()])
-            parts.append(f"Services: {services}")
-        
-        if self.target_state['vulnerabilities']:
-            parts.append(f"Vulnerabilities: {', '.join(self.target_state['vulnerabilities'])}")
-        
-        if self.target_state['key_findings']:
-            recent = self.target_state['key_findings'][-3:]
-            parts.append(f"Key Findings: {'; '.join(recent)}")
-        
-        return '\n'.join(parts)
-    
-    async def _extract_state_from_notes(self, notes: str) -> dict:
-        extraction_llm = LLMClient(AppSettings.get_llm_config("brain_llm"))
+    async def _ask_brain_for_structured_notes(self, result: str) -> tuple:
+        """Have the Brain write its notes and the extracted target state in one structured call"""
+        if self.debug_extraction:
+            response_format, schema = DebugBrainNotes, _DEBUG_BRAIN_NOTES_SCHEMA
+            reasoning_instruction = "\nFor each piece of information you extract, explain your reasoning in the steps array.\n"
+        else:
+            response_format, schema = BrainNotes, _BRAIN_NOTES_SCHEMA
+            reasoning_instruction = ""
+        
+        if len(result) > MAX_NOTES_CHARS:
+            self.event_sink.emit(TaskEvent(
+                event_type="notes_truncated",
+                trace_id=self.session_id,
+                timestamp=datetime.now(),
+                data={"original_chars": len(result), "kept_chars": MAX_NOTES_CHARS}
+            ))
+            half = MAX_NOTES_CHARS // 2
+            result = f"{result[:half]}\n... [{len(result) - MAX_NOTES_CHARS} characters omitted] ...\n{result[-half:]}"
         
-        extraction_prompt = f"""Extract structured data from these technical penetration testing notes. Think step by step.
-
-Notes:
-{notes}
+        # The decision the worker acted on is the last message in the Brain's
+        # history, so it is not repeated here
+        notes_prompt = f"""Worker reported: {result}
 
-Analyze the notes and extract:
+Update your notes with key findings. Write concise technical notes about what was discovered in "notes", and extract:
 1. **Open Ports**: Only actual network ports (22, 80, 443, etc.), NOT version numbers or iteration counts
 2. **Services**: List of services with their port and name/version
 3. **Vulnerabilities**: Security issues, CVEs, exploitable weaknesses
 4. **Key Findings**: Credentials, endpoints, access points, important discoveries
-
-For each piece of information you extract, explain your reasoning in the steps array.
-
+{reasoning_instruction}
 Rules:
 - Be precise: Don't confuse version numbers (8.2) with port numbers
 - Only extract ports that are explicitly mentioned as network ports
@@ -446,112 +703,213 @@ Rules:
 - If nothing found for a field, use empty list
 """
 
+        # The notes exchange is not kept in the Brain's history; what matters
+        # from it is carried forward in target_state
+        memory = self.brain_session.memory
+        messages = self.brain_session.prompt_builder.build(
+            memory.summary(self.brain_thread_id),
+            memory.last_events(self.brain_thread_id, self.brain_session.agent.keep_last),
+            [],
+            notes_prompt
+        )
+        messages.append({"role": "user", "content": notes_prompt})
+        
         try:
-            result = await extraction_llm.parse(
-                messages=[{"role": "user", "content": extraction_prompt}],
-                response_format=TargetStateExtraction,
-                temperature=0.1
-            )
+            async with self._rate_limiter, self._llm_sem():
+                parsed = await self.extraction_llm.parse(
+                    messages=messages,
+                    response_format=response_format,
+                    temperature=0.1,
+                    schema=schema
+                )
             
-            if result is None:
+            if parsed is None:
                 raise Exception("Structured parsing returned None")
             
-            print(f"\n[{self._timestamp()}] 🧠 EXTRACTION REASONING:")
-            for i, step in enumerate(result.steps, 1):
-                print(f"[{self._timestamp()}]   Step {i}: {step.reasoning}")
-                print(f"[{self._timestamp()}]     → {step.extracted_info}")
+            if self.debug_extraction:
+                ts = self._timestamp()
+                lines = [f"\n[{ts}] 🧠 EXTRACTION REASONING:"]
+                for i, step in enumerate(parsed.steps, 1):
+                    lines += [f"[{ts}]   Step {i}: {step.reasoning}", f"[{ts}]     → {step.extracted_info}"]
+                self._print_block(lines)
             
-            services_dict = {svc.port: svc.service for svc in result.services}
-            
-            return {
-                "open_ports": result.open_ports,
-                "services": services_dict,
-                "vulnerabilities": result.vulnerabilities,
-                "key_findings": result.key_findings
+            return parsed.notes.strip(), {
+                "open_ports": parsed.open_ports,
+                "services": {svc.port: svc.service for svc in parsed.services},
+                "vulnerabilities": parsed.vulnerabilities,
+                "key_findings": parsed.key_findings
             }
         except Exception as e:
-            print(f"[{self._timestamp()}] ⚠️  Extraction failed: {e}")
-            import traceback
-            traceback.print_exc()
-            return {
+            print(f"[{self._timestamp()}] ❌ Brain notes error: {e}")
+            return "", {
                 "open_ports": [],
                 "services": {},
                 "vulnerabilities": [],
                 "key_findings": []
             }
     
-    def _update_target_state(self, extracted: dict) -> None:
-        for port in extracted["open_ports"]:
-            if port not in self.target_state["open_ports"]:
-                self.target_state["open_ports"].append(port)
+    def _build_brain_context(self) -> str:
+        # Only the working directory and iteration change every call; the
+        # target state part is re-rendered after _update_target_state.
+        if self._state_dirty:
+            self._state_context = self._render_state_context()
+            self._state_dirty = False
+        
+        current_dir = self.command_executor.get_current_directory()
+        parts = [
+            self._context_header,
+            f"Working Directory: {current_dir}",
+            f"Iteration: {self.iteration_count}/{self.max_iterations}"
+        ]
+        if self._state_context:
+            parts.append(self._state_context)
+        
+        return '\n'.join(parts)
+    
+    def _render_state_context(self) -> str:
+        parts = []
+        
+        if self._ports_csv:
+            parts.append(f"Open Ports: {self._ports_csv}")
         
-        self.target_state["services"].update(extracted["services"])
+        if self._services_csv:
+            parts.append(f"Services: {self._services_csv}")
+        
+        if self.target_state['vulnerabilities']:
+            parts.append(f"Vulnerabilities: {', '.join(self.target_state['vulnerabilities'])}")
+        
+        if self.target_state['key_findings']:
+            findings = self.target_state['key_findings']
+            recent = itertools.islice(findings, max(0, len(findings) - 3), None)
+            parts.append(f"Key Findings: {'; '.join(recent)}")
+        
+        return '\n'.join(parts)
+    
+    def _update_target_state(self, extracted: dict) -> None:
+        # The rendered state context is only invalidated when something
+        # actually changed; repeated extractions of known facts keep it
+        changed = False
+        
+        new_ports = {int(p) for p in extracted["open_ports"]} - self._open_ports
+        if new_ports:
+            self._open_ports |= new_ports
+            self.target_state["open_ports"] = sorted(self._open_ports)
+            self._ports_csv = ', '.join(map(str, self.target_state["open_ports"]))
+            changed = True
+        
+        services = self.target_state["services"]
+        services_changed = False
+        for port, service in extracted["services"].items():
+            # Port and service names repeat across iterations; interning keeps one copy
+            port = sys.intern(str(port))
+            if services.get(port) != service:
+                services[port] = sys.intern(service)
+                services_changed = True
+        if services_changed:
+            self._services_csv = ', '.join(f"{port}:{svc}" for port, svc in services.items())
+            changed = True
         
         for vuln in extracted["vulnerabilities"]:
-            if vuln not in self.target_state["vulnerabilities"]:
+            if vuln not in self._vulns_seen:
+                self._vulns_seen.add(vuln)
                 self.target_state["vulnerabilities"].append(vuln)
+                changed = True
         
         for finding in extracted["key_findings"]:
-            if finding not in self.target_state["key_findings"]:
+            if finding not in self._findings_seen:
+                self._findings_seen.add(finding)
                 self.target_state["key_findings"].append(finding)
+                changed = True
+        
+        if changed:
+            self._state_dirty = True
     
     def _should_stop(self, brain_decision: str) -> bool:
-        stop_keywords = ['complete', 'finished', 'done', 'success', 'accomplished']
-        return any(keyword in brain_decision.lower() for keyword in stop_keywords)
-    
-    def _print_session_history(self):
-        """Print complete session history with all Brain decisions and Worker results"""
-        print(f"\n\n{'='*80}")
-        print(f"📜 SESSION HISTORY")
-        print(f"{'='*80}")
-        print(f"Target: {self.target}")
-        print(f"Goal: {self.goal}")
-        print(f"Total Iterations: {self.iteration_count}")
-        print(f"{'='*80}\n")
-        
+        return _STOP_RE.search(brain_decision) is not None
+    
+    def _print_session_history(self, tail: Optional[int] = 20):
+        """Print the last `tail` Brain and Worker messages (all of them if tail is None)"""
         # Get conversation history from both agents
         brain_history = self.brain_session.get_history()
-        worker_history = self.worker_session.get_history()
-        
-        print("🧠 BRAIN CONVERSATION HISTORY:")
-        print(f"{'─'*80}")
-        for i, msg in enumerate(brain_history, 1):
-            if msg.role == "user":
-                print(f"\n[{i}] USER → BRAIN:")
-                print(f"  {msg.content}")
-            elif msg.role == "assistant":
-                print(f"\n[{i}] BRAIN RESPONSE:")
-                print(f"  {msg.content}")
-        print(f"\n{'─'*80}\n")
-        
-        print("🔧 WORKER CONVERSATION HISTORY:")
-        print(f"{'─'*80}")
-        for i, msg in enumerate(worker_history, 1):
-            if msg.role == "user":
-                print(f"\n[{i}] BRAIN → WORKER:")
-                print(f"  {msg.content}")
-            elif msg.role == "assistant":
-                print(f"\n[{i}] WORKER RESPONSE:")
-                print(f"  {msg.content}")
-        print(f"\n{'─'*80}\n")
-        
-        print("📊 FINAL TARGET STATE:")
-        print(f"{'─'*80}")
-        print(f"Target: {self.target_state['target_ip']}")
-        print(f"Goal: {self.target_state['goal']}")
+        worker_history = self._worker_session.get_history() if self._worker_session else []
+        
+        # The full transcript always goes to the trace file
+        self.event_sink.emit(TaskEvent(
+            event_type="brain_session_transcript",
+            trace_id=self.session_id,
+            timestamp=datetime.now(),
+            data={
+                "brain": [{"role": msg.role, "content": msg.content} for msg in brain_history],
+                "worker": [{"role": msg.role, "content": msg.content} for msg in worker_history]
+            }
+        ))
+        
+        lines = []
+        if self.verbose:
+            lines += [
+                f"\n\n{'='*80}",
+                f"📜 SESSION HISTORY",
+                f"{'='*80}",
+                f"Target: {self.target}",
+                f"Goal: {self.goal}",
+                f"Total Iterations: {self.iteration_count}",
+                f"{'='*80}\n",
+                "🧠 BRAIN CONVERSATION HISTORY:",
+                f"{'─'*80}"
+            ]
+            lines += self._history_tail_note(brain_history, tail)
+            for i, msg in self._history_tail(brain_history, tail):
+                if msg.role == "user":
+                    lines += [f"\n[{i}] USER → BRAIN:", f"  {msg.content}"]
+                elif msg.role == "assistant":
+                    lines += [f"\n[{i}] BRAIN RESPONSE:", f"  {msg.content}"]
+            lines += [f"\n{'─'*80}\n", "🔧 WORKER CONVERSATION HISTORY:", f"{'─'*80}"]
+            lines += self._history_tail_note(worker_history, tail)
+            for i, msg in self._history_tail(worker_history, tail):
+                if msg.role == "user":
+                    lines += [f"\n[{i}] BRAIN → WORKER:", f"  {msg.content}"]
+                elif msg.role == "assistant":
+                    lines += [f"\n[{i}] WORKER RESPONSE:", f"  {msg.content}"]
+            lines.append(f"\n{'─'*80}\n")
+        
+        lines += [
+            "📊 FINAL TARGET STATE:",
+            f"{'─'*80}",
+            f"Target: {self.target_state['target_ip']}",
+            f"Goal: {self.target_state['goal']}"
+        ]
         if self.target_state['open_ports']:
-            print(f"Open Ports: {self.target_state['open_ports']}")
+            lines.append(f"Open Ports: {self.target_state['open_ports']}")
         if self.target_state['services']:
-            print(f"Services: {self.target_state['services']}")
+            lines.append(f"Services: {self.target_state['services']}")
         if self.target_state['vulnerabilities']:
-            print(f"Vulnerabilities ({len(self.target_state['vulnerabilities'])} total):")
+            lines.append(f"Vulnerabilities ({len(self.target_state['vulnerabilities'])} total):")
             for i, vuln in enumerate(self.target_state['vulnerabilities'][:5], 1):
-                print(f"  {i}. {vuln}")
+                lines.append(f"  {i}. {vuln}")
         if self.target_state['key_findings']:
-            print(f"Key Findings ({len(self.target_state['key_findings'])} total):")
-            for i, finding in enumerate(self.target_state['key_findings'][:5], 1):
-                print(f"  {i}. {finding}")
-        print(f"{'─'*80}\n")
+            lines.append(f"Key Findings ({len(self.target_state['key_findings'])} total):")
+            for i, finding in enumerate(itertools.islice(self.target_state['key_findings'], 5), 1):
+                lines.append(f"  {i}. {finding}")
+        lines.append(f"{'─'*80}\n")
+        self._print_block(lines)
+    
+    @staticmethod
+    def _history_tail(history: List[Message], tail: Optional[int]):
+        start = 0 if tail is None else max(0, len(history) - tail)
+        return enumerate(itertools.islice(history, start, None), start + 1)
+    
+    @staticmethod
+    def _history_tail_note(history: List[Message], tail: Optional[int]) -> List[str]:
+        if tail is None or len(history) <= tail:
+            return []
+        return [f"  ... {len(history) - tail} earlier messages omitted (full transcript in the trace file)"]
+    
+    def _write_report(self, report: str) -> None:
+        try:
+            with open(self.report_file, 'w', encoding='utf-8') as f:
+                f.write(report)
+        except OSError as e:
+            print(f"[{self._timestamp()}] ⚠️  Could not write report to {self.report_file}: {e}")
     
     async def _generate_final_report(self) -> str:
         """Generate final penetration testing report"""
@@ -572,19 +930,14 @@ Create a professional penetration testing report with:
 Report:"""
         
         try:
-            report, _ = await self.brain_session.ask(report_prompt)
-            return f"""
-🧠 BRAIN SESSION REPORT
-{'=' * 60}
-Target: {self.target}
-Goal: {self.goal}
-Iterations: {self.iteration_count}/{self.max_iterations}
-Duration: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-{report}
-
-{'=' * 60}
-Session completed successfully!
-            """.strip()
+            async with self._llm_sem():
+                report, _ = await self.brain_session.ask(report_prompt)
+            return ''.join((
+                self._report_header,
+                f"Iterations: {self.iteration_count}/{self.max_iterations}\n",
+                f"Duration: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+                report,
+                _REPORT_FOOTER
+            ))
         except Exception as e:
             return f"Error generating report: {str(e)}"
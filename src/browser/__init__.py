@@ -1,3 +1,4 @@
-from .stealth_browser import StealthBrowser, GoogleSearch, WebpageFetcher
+from .stealth_browser import StealthBrowser, GoogleSearch, WebpageFetcher, BrowserPool, get_browser_pool, close_browser_pools
+from .runtime import run_coro, run_coro_async
 
-__all__ = ['StealthBrowser', 'GoogleSearch', 'WebpageFetcher']
+__all__ = ['StealthBrowser', 'GoogleSearch', 'WebpageFetcher', 'BrowserPool', 'get_browser_pool', 'close_browser_pools', 'run_coro', 'run_coro_async']
@@ -0,0 +1,54 @@
+import asyncio
+import atexit
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional
+
+from .stealth_browser import close_browser_pools
+
+# Browser work from the synchronous commands runs on one long-lived event
+# loop in a daemon thread, so the pooled browser (which is bound to the loop
+# that started it) survives from one call to the next.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="browser-loop", daemon=True).start()
+            atexit.register(_shutdown)
+            _loop = loop
+        return _loop
+
+
+def run_coro(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared browser loop and block until it finishes"""
+    future = asyncio.run_coroutine_threadsafe(coro, get_loop())
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+async def run_coro_async(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Await a coroutine on the shared browser loop from another event loop"""
+    future = asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, get_loop()))
+    # Timing out cancels the wrapped future, which cancels the task on the
+    # browser loop as well
+    return await asyncio.wait_for(future, timeout)
+
+
+def _shutdown():
+    # The pooled browser and Playwright driver live for the whole process;
+    # close them cleanly at exit rather than leaving the driver to notice
+    # its pipe closing
+    future = asyncio.run_coroutine_threadsafe(close_browser_pools(), _loop)
+    try:
+        future.result(10)
+    except Exception:
+        pass
+    _loop.call_soon_threadsafe(_loop.stop)
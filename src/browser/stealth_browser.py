@@ -1,50 +1,386 @@
 import asyncio
-from playwright.async_api import async_playwright, Page
+import json
+import weakref
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 from typing import List, Dict, Optional
 from abc import ABC, abstractmethod
+from types import MappingProxyType
+from urllib.parse import urljoin, urlparse
 
-class StealthBrowser(ABC):
-    def __init__(self, headless: bool = False, user_agent: Optional[str] = None):
-        self.headless = headless
-        self.user_agent = user_agent or 'Mozilla/5.0 (X11; Linux x86_64; rv:142.0) Gecko/20100101 Firefox/142.0'
-        self.firefox_prefs = {
-            'dom.webdriver.enabled': False,
-            'useAutomationExtension': False,
-            'privacy.trackingprotection.enabled': False,
-            'geo.enabled': False,
-            'permissions.default.desktop-notification': 1,
-            'dom.push.enabled': False,
-            'dom.webnotifications.enabled': False,
-            'media.navigator.enabled': True,
-            'media.peerconnection.enabled': True,
-            'media.navigator.video.enabled': True,
-            'dom.webaudio.enabled': True
+# httpx and selectolax enable the browser-free fast path for static pages,
+# and selectolax also parses rendered pages in-process; without them every
+# page is rendered in Firefox and extracted by _EXTRACT_JS
+try:
+    import httpx
+except Exception:
+    httpx = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except Exception:
+    LexborHTMLParser = None
+
+# orjson encodes the structured output several times faster than the stdlib
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+_DEFAULT_USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64; rv:142.0) Gecko/20100101 Firefox/142.0'
+
+# Shared, read-only settings; every browser and context is created from these
+_FIREFOX_PREFS = MappingProxyType({
+    'dom.webdriver.enabled': False,
+    'useAutomationExtension': False,
+    'privacy.trackingprotection.enabled': False,
+    'geo.enabled': False,
+    'permissions.default.desktop-notification': 1,
+    'dom.push.enabled': False,
+    'dom.webnotifications.enabled': False,
+    'media.navigator.enabled': True,
+    'media.peerconnection.enabled': True,
+    'media.navigator.video.enabled': True,
+    'dom.webaudio.enabled': True
+})
+
+_CONTEXT_OPTIONS = MappingProxyType({
+    'viewport': {'width': 1366, 'height': 768},
+    'locale': 'en-US',
+    'timezone_id': 'America/New_York',
+    'geolocation': None,
+    'permissions': [],
+    'accept_downloads': False
+})
+
+# Page chrome removed before extraction
+_SELECTORS_TO_REMOVE = (
+    'header',
+    'footer',
+    'nav',
+    '[role="navigation"]',
+    '.sidebar',
+    '#sidebar',
+    'aside',
+    'script',
+    'style',
+    'noscript'
+)
+
+_SEMANTIC_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'li', 'td', 'th', 'blockquote', 'pre', 'code', 'span')
+
+# Joined once so the page runs a single querySelectorAll for the removals
+_REMOVE_SELECTOR = ','.join(_SELECTORS_TO_REMOVE)
+
+_SEMANTIC_TAG_SET = frozenset(_SEMANTIC_TAGS)
+
+# A statically fetched page with fewer text elements than this is assumed to
+# need JavaScript and is rendered in the browser instead
+_MIN_STATIC_ELEMENTS = 5
+
+# The static attempt runs before any rendering, so it gives up quickly on a
+# slow server rather than delaying the browser fallback
+_STATIC_FETCH_TIMEOUT = 3
+
+# Resource types extraction never needs; blocked when block_resources is set
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+# Playwright's :has-text() is not valid in querySelectorAll, so button labels
+# are matched separately from the plain CSS selectors
+_COOKIE_BUTTON_TEXTS = ('Accept all', 'Accept', 'I agree', 'OK')
+_COOKIE_SELECTORS = (
+    '[id*="accept"]',
+    '[class*="accept"]'
+)
+
+# Page-side scripts are module constants and take their selectors as
+# evaluate arguments, so the same source is sent on every call
+
+# Removes page chrome, then collects the text of semantic elements with
+# their links replaced by [LINK:N] placeholders
+_EXTRACT_JS = '''
+([tags, removeSelector]) => {
+    document.querySelectorAll(removeSelector).forEach(el => el.remove());
+
+    // One walk over the body's elements, in document order, with a tag-name
+    // lookup instead of matching the compound selector against every node
+    const wanted = new Set(tags.map(t => t.toUpperCase()));
+    const all = (document.body || document.documentElement).getElementsByTagName('*');
+    const elements = [];
+    for (let i = 0; i < all.length; i++) {
+        if (wanted.has(all[i].tagName)) elements.push(all[i]);
+    }
+    const structured_text = [];
+    const link_map = [];
+    // A link (same text and href) gets one index however many times it
+    // appears, including in nested elements
+    const linkKeyToIndex = new Map();
+    const linkIndexFor = (linkText, href) => {
+        const key = linkText + '\\0' + href;
+        let linkIndex = linkKeyToIndex.get(key);
+        if (linkIndex === undefined) {
+            linkIndex = link_map.length;
+            linkKeyToIndex.set(key, linkIndex);
+            link_map.push({
+                index: linkIndex,
+                text: linkText,
+                href: href
+            });
+        }
+        return linkIndex;
+    };
+    const words = s => s.split(/\\s+/).filter(word => word.length > 0);
+
+    // Assembles an element's text from its child nodes, emitting [LINK:N]
+    // in place of each link as it is reached
+    const walk = (node, plain, parts) => {
+        for (const child of node.childNodes) {
+            if (child.nodeType === Node.TEXT_NODE) {
+                plain.push(child.data);
+                parts.push(child.data);
+            } else if (child.nodeType === Node.ELEMENT_NODE) {
+                const linkText = child.nodeName === 'A' && child.href ? words(child.textContent).join(' ') : '';
+                if (linkText) {
+                    plain.push(linkText);
+                    parts.push(`[LINK:${linkIndexFor(linkText, child.href)}]`);
+                } else {
+                    walk(child, plain, parts);
+                }
+            }
+        }
+    };
+
+    elements.forEach(el => {
+        const plain = [];
+        const parts = [];
+        walk(el, plain, parts);
+
+        // Filter out elements with 3 words or less
+        if (words(plain.join('')).length <= 3) return;
+
+        structured_text.push({
+            tag: el.tagName.toLowerCase(),
+            text: words(parts.join('')).join(' ')
+        });
+    });
+
+    return {
+        structured_text: structured_text,
+        link_map: link_map
+    };
+}
+'''
+
+_RESULT_CONTAINER = 'div[data-ved]:has(h3)'
+
+# Reads every Google result container (title, link and the first span long
+# enough to be the snippet) in one pass over the DOM
+_PARSE_RESULTS_JS = '''
+(selector) => {
+    const results = [];
+    document.querySelectorAll(selector).forEach(container => {
+        const h3 = container.querySelector('h3');
+        const link = container.querySelector('a:has(h3)');
+        const title = h3 ? h3.textContent : null;
+        const url = link ? link.getAttribute('href') : null;
+        if (!title || !url) return;
+
+        // Nested spans repeat their parent's text; each text is checked once
+        let snippet = null;
+        const seen = new Set();
+        for (const span of container.querySelectorAll('span')) {
+            const text = span.textContent;
+            if (!text || seen.has(text)) continue;
+            seen.add(text);
+            if (text.trim().length > 30 && !text.includes(title)) {
+                snippet = text.trim();
+                break;
+            }
         }
-        self.context_options = {
-            'viewport': {'width': 1366, 'height': 768},
-            'locale': 'en-US',
-            'timezone_id': 'America/New_York',
-            'geolocation': None,
-            'permissions': [],
-            'accept_downloads': False
+
+        results.push({title: title.trim(), url: url, snippet: snippet});
+    });
+    return results;
+}
+'''
+_DOM_SIZE_JS = "() => document.getElementsByTagName('*').length"
+
+# Clicks the first visible cookie/consent button, matched by label first
+# and by selector second
+_DISMISS_POPUP_JS = '''
+([buttonTexts, selectors]) => {
+    const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const buttons = Array.from(document.querySelectorAll('button'));
+    for (const wanted of buttonTexts) {
+        const needle = wanted.toLowerCase();
+        const button = buttons.find(b => visible(b) && (b.innerText || '').toLowerCase().includes(needle));
+        if (button) {
+            button.click();
+            return true;
+        }
+    }
+    for (const sel of selectors) {
+        const el = Array.from(document.querySelectorAll(sel)).find(visible);
+        if (el) {
+            el.click();
+            return true;
         }
+    }
+    return false;
+}
+'''
+
+def extract_structured_html(html: str, base_url: str) -> Dict:
+    """In-process equivalent of _EXTRACT_JS, for HTML that needs no rendering"""
+    tree = LexborHTMLParser(html)
+    structured_text = []
+    link_map = []
+    link_index_by_key = {}
+    root = tree.body
+    if root is None:
+        return {'structured_text': structured_text, 'link_map': link_map}
     
-    async def _create_stealth_page(self, playwright) -> tuple:
-        browser = await playwright.firefox.launch(
-            headless=self.headless,
-            firefox_user_prefs=self.firefox_prefs
-        )
+    # Only the outermost matches are removed; their descendants go with them
+    removed = []
+    stack = [root]
+    while stack:
+        child = stack.pop().child
+        while child is not None:
+            if child.is_element_node:
+                if child.css_matches(_REMOVE_SELECTOR):
+                    removed.append(child)
+                else:
+                    stack.append(child)
+            child = child.next
+    for node in removed:
+        node.decompose()
+    
+    def link_index(link_text: str, href: str) -> int:
+        # A link gets one index however often it appears
+        key = (link_text, href)
+        index = link_index_by_key.get(key)
+        if index is None:
+            index = link_index_by_key[key] = len(link_map)
+            link_map.append({'index': index, 'text': link_text, 'href': href})
+        return index
+    
+    def walk(node, parts: List[str]):
+        # Assembles the text from child nodes, emitting [LINK:N] in place of
+        # each link as it is reached
+        child = node.child
+        while child is not None:
+            if child.is_text_node:
+                parts.append(child.text_content)
+            elif child.is_element_node:
+                href = child.attributes.get('href') if child.tag == 'a' else None
+                link_text = ' '.join(child.text().split()) if href else ''
+                if link_text:
+                    parts.append(f'[LINK:{link_index(link_text, urljoin(base_url, href))}]')
+                else:
+                    walk(child, parts)
+            child = child.next
+    
+    for el in root.traverse():
+        if el.tag not in _SEMANTIC_TAG_SET:
+            continue
+        # Filter out elements with 3 words or less
+        if len(el.text().split()) <= 3:
+            continue
         
-        context = await browser.new_context(
+        parts = []
+        walk(el, parts)
+        structured_text.append({'tag': el.tag, 'text': ' '.join(''.join(parts).split())})
+    
+    return {'structured_text': structured_text, 'link_map': link_map}
+
+class BrowserPool:
+    """
+    Keeps one Playwright driver and one Firefox process alive and hands out a
+    fresh BrowserContext per request, so only the first request pays for
+    starting the browser. Playwright objects are bound to the event loop that
+    created them, so there is one pool per loop (see get_browser_pool).
+    """
+    
+    def __init__(self, headless: bool, firefox_prefs: Dict):
+        self.headless = headless
+        self.firefox_prefs = firefox_prefs
+        self._playwright = None
+        self._browser: Optional[Browser] = None
+        self._lock = asyncio.Lock()
+    
+    async def _get_browser(self) -> Browser:
+        async with self._lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.firefox.launch(
+                    headless=self.headless,
+                    firefox_user_prefs=dict(self.firefox_prefs)
+                )
+            return self._browser
+    
+    async def get_context(self, **options) -> BrowserContext:
+        browser = await self._get_browser()
+        return await browser.new_context(**options)
+    
+    async def close(self):
+        async with self._lock:
+            if self._browser is not None:
+                try:
+                    await self._browser.close()
+                except Exception:
+                    pass
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[bool, BrowserPool]]" = weakref.WeakKeyDictionary()
+
+def get_browser_pool(headless: bool, firefox_prefs: Dict) -> BrowserPool:
+    loop = asyncio.get_running_loop()
+    pools = _pools.setdefault(loop, {})
+    pool = pools.get(headless)
+    if pool is None:
+        pool = pools[headless] = BrowserPool(headless, firefox_prefs)
+    return pool
+
+async def close_browser_pools():
+    """Shut down the browsers pooled on the running event loop"""
+    pools = _pools.pop(asyncio.get_running_loop(), {})
+    for pool in pools.values():
+        await pool.close()
+
+async def _block_unneeded_resources(route):
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+class StealthBrowser(ABC):
+    def __init__(self, headless: bool = False, user_agent: Optional[str] = None,
+                 block_resources: bool = False):
+        self.headless = headless
+        self.block_resources = block_resources
+        self.user_agent = user_agent or _DEFAULT_USER_AGENT
+        self.firefox_prefs = _FIREFOX_PREFS
+        self.context_options = _CONTEXT_OPTIONS
+    
+    async def _create_stealth_page(self) -> tuple:
+        # The browser is shared through the pool; each page gets its own
+        # context, which the caller closes when done
+        pool = get_browser_pool(self.headless, self.firefox_prefs)
+        context = await pool.get_context(
             user_agent=self.user_agent,
             **self.context_options
         )
         
         await context.add_init_script("delete Object.getPrototypeOf(navigator).webdriver;")
+        if self.block_resources:
+            await context.route("**/*", _block_unneeded_resources)
         
         page = await context.new_page()
         
-        return browser, page
+        return context, page
     
     @abstractmethod
     async def execute(self, *args, **kwargs):
@@ -55,196 +391,145 @@ class GoogleSearch(StealthBrowser):
         super().__init__(headless, user_agent)
     
     async def execute(self, query: str, num_results: int = 20) -> List[Dict[str, str]]:
-        async with async_playwright() as p:
-            browser, page = await self._create_stealth_page(p)
-            
+        context, page = await self._create_stealth_page()
+        try:
             url = f'https://www.google.com/search?q={"+".join(query.split())}&num={num_results}'
-            await page.goto(url)
-            await page.wait_for_load_state('networkidle')
-            
-            results = await self._parse_results(page)
-            
-            await browser.close()
+            await page.goto(url, wait_until='domcontentloaded')
+            # Results are read as soon as the first one is in the DOM rather
+            # than after the network goes quiet
+            try:
+                await page.locator(_RESULT_CONTAINER).first.wait_for(timeout=5000)
+            except:
+                pass
             
-            return results
+            return await self._parse_results(page)
+        finally:
+            await context.close()
     
     async def _parse_results(self, page: Page) -> List[Dict[str, str]]:
-        results = []
-        containers = await page.locator('div[data-ved]:has(h3)').all()
+        return await page.evaluate(_PARSE_RESULTS_JS, _RESULT_CONTAINER)
+
+class WebpageFetcher(StealthBrowser):
+    def __init__(self, headless: bool = False, user_agent: Optional[str] = None,
+                 block_resources: bool = True, save_raw_html: bool = True):
+        # Only text and links are extracted, so images, media, fonts and
+        # stylesheets are not downloaded by default
+        super().__init__(headless, user_agent, block_resources)
+        # Without the raw HTML file a rendered page's document is never
+        # serialized over to Python; only the structured data comes back
+        self.save_raw_html = save_raw_html
+    
+    async def execute(self, url: str, output_file: Optional[str] = None) -> Dict[str, str]:
+        # Static pages are fetched and parsed without a browser; anything that
+        # looks like it needs JavaScript is rendered in Firefox
+        fetched = await self._fetch_static(url)
+        if fetched is None:
+            fetched = await self._fetch_rendered(url)
+        status_code, html_content, structured_data = fetched
         
-        for container in containers:
-            result = await self._extract_result(container)
-            if result:
-                results.append(result)
+        # Save full HTML
+        html_file = output_file
+        if not html_file:
+            domain = urlparse(url).netloc.replace('www.', '').replace('.', '_')
+            html_file = f"{domain}.html"
         
-        return results
+        # Save structured content alongside; both files are encoded and
+        # written in worker threads so large pages don't block the loop
+        structured_file = html_file.replace('.html', '_structured.json')
+        writes = [asyncio.to_thread(self._write_json, structured_file, structured_data)]
+        if self.save_raw_html:
+            writes.append(asyncio.to_thread(self._write_text, html_file, html_content))
+        else:
+            html_file = None
+        await asyncio.gather(*writes)
+        
+        return {
+            'html_file': html_file,
+            'structured_file': structured_file,
+            'url': url,
+            'status_code': status_code,
+            'text_elements': len(structured_data['structured_text']),
+            'links_found': len(structured_data['link_map'])
+        }
     
-    async def _extract_result(self, container) -> Optional[Dict[str, str]]:
+    async def _fetch_static(self, url: str) -> Optional[tuple]:
+        if httpx is None or LexborHTMLParser is None:
+            return None
         try:
-            title = await container.locator('h3').first.text_content()
-            url = await container.locator('a:has(h3)').first.get_attribute('href')
-            snippet = await self._extract_snippet(container, title)
-            
-            if title and url:
-                return {
-                    'title': title.strip(),
-                    'url': url,
-                    'snippet': snippet
-                }
-        except:
-            pass
-        return None
-    
-    async def _extract_snippet(self, container, title: str) -> Optional[str]:
-        snippet_elements = await container.locator('span').all()
-        for span in snippet_elements:
-            text = await span.text_content()
-            if text and len(text.strip()) > 30 and title not in text:
-                return text.strip()
-        return None
-
-class WebpageFetcher(StealthBrowser):
-    def __init__(self, headless: bool = False, user_agent: Optional[str] = None):
-        super().__init__(headless, user_agent)
+            async with httpx.AsyncClient(follow_redirects=True, timeout=_STATIC_FETCH_TIMEOUT) as client:
+                response = await client.get(url, headers={'User-Agent': self.user_agent})
+        except (httpx.HTTPError, httpx.InvalidURL):
+            return None
+        if response.status_code >= 400 or 'html' not in response.headers.get('content-type', ''):
+            return None
+        
+        html_content = response.text
+        structured_data = await asyncio.to_thread(extract_structured_html, html_content, str(response.url))
+        if len(structured_data['structured_text']) < _MIN_STATIC_ELEMENTS:
+            return None
+        return response.status_code, html_content, structured_data
     
-    async def execute(self, url: str, output_file: Optional[str] = None) -> Dict[str, str]:
-        async with async_playwright() as p:
-            browser, page = await self._create_stealth_page(p)
-            
-            response = await page.goto(url, timeout=20000)
+    async def _fetch_rendered(self, url: str) -> tuple:
+        context, page = await self._create_stealth_page()
+        try:
+            response = await page.goto(url, timeout=20000, wait_until='domcontentloaded')
             status_code = response.status if response else "Unknown"
             
-            # Try networkidle first, fallback to domcontentloaded if it times out
+            # Pages whose DOM has settled by DOMContentLoaded are extracted
+            # right away; only pages still building their DOM wait for the
+            # network to go quiet
             try:
-                await page.wait_for_load_state('networkidle', timeout=10000)
+                size = await page.evaluate(_DOM_SIZE_JS)
+                await asyncio.sleep(0.3)
+                if await page.evaluate(_DOM_SIZE_JS) != size:
+                    await page.wait_for_load_state('networkidle', timeout=10000)
             except:
-                try:
-                    await page.wait_for_load_state('domcontentloaded', timeout=5000)
-                except:
-                    # If all else fails, just wait a bit for content to load
-                    await asyncio.sleep(3)
+                pass
             
             await self._handle_popups(page)
             
-            html_content = await page.content()
-            structured_data = await self._extract_structured_content(page)
-            
-            # Save full HTML
-            html_file = output_file
-            if not html_file:
-                from urllib.parse import urlparse
-                domain = urlparse(url).netloc.replace('www.', '').replace('.', '_')
-                html_file = f"{domain}.html"
+            if not self.save_raw_html:
+                return status_code, None, await self._extract_structured_content(page)
             
-            with open(html_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            # Save structured content
-            structured_file = html_file.replace('.html', '_structured.json')
-            import json
-            with open(structured_file, 'w', encoding='utf-8') as f:
-                json.dump(structured_data, f, indent=2, ensure_ascii=False)
-            
-            await browser.close()
+            html_content = await page.content()
+            # The rendered HTML is already here, so it is parsed in-process
+            # rather than walked again in the page
+            if LexborHTMLParser is not None:
+                structured_data = await asyncio.to_thread(extract_structured_html, html_content, page.url)
+            else:
+                structured_data = await self._extract_structured_content(page)
             
-            return {
-                'html_file': html_file,
-                'structured_file': structured_file,
-                'url': url,
-                'status_code': status_code,
-                'text_elements': len(structured_data['structured_text']),
-                'links_found': len(structured_data['link_map'])
-            }
+            return status_code, html_content, structured_data
+        finally:
+            await context.close()
+    
+    @staticmethod
+    def _write_text(path: str, text: str):
+        with open(path, 'wb') as f:
+            f.write(text.encode('utf-8'))
+    
+    @staticmethod
+    def _write_json(path: str, data: Dict):
+        if orjson is not None:
+            encoded = orjson.dumps(data)
+        else:
+            encoded = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(encoded)
     
     async def _extract_structured_content(self, page: Page) -> Dict:
-        # Remove unwanted elements
-        selectors_to_remove = [
-            'header',
-            'footer', 
-            'nav',
-            '[role="navigation"]',
-            '.sidebar',
-            '#sidebar',
-            'aside',
-            'script',
-            'style',
-            'noscript'
-        ]
-        
-        for selector in selectors_to_remove:
-            await page.evaluate(f'''
-                document.querySelectorAll('{selector}').forEach(el => el.remove())
-            ''')
-        
-        # Extract structured content
-        semantic_tags = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'li', 'td', 'th', 'blockquote', 'pre', 'code', 'span']
-        
-        result = await page.evaluate(f'''
-            () => {{
-                const tags = {semantic_tags};
-                const selector = tags.join(',');
-                const elements = document.querySelectorAll(selector);
-                const structured_text = [];
-                const link_map = [];
-                
-                elements.forEach(el => {{
-                    let text = el.innerText?.trim();
-                    if (!text) return;
-                    
-                    // Filter out elements with 3 words or less
-                    const wordCount = text.split(/\s+/).filter(word => word.length > 0).length;
-                    if (wordCount <= 3) return;
-                    
-                    // Find all links within this element
-                    const links = el.querySelectorAll('a[href]');
-                    links.forEach(link => {{
-                        const linkText = link.innerText.trim();
-                        const href = link.href;
-                        
-                        if (linkText && href) {{
-                            const linkIndex = link_map.length;
-                            link_map.push({{
-                                index: linkIndex,
-                                text: linkText,
-                                href: href
-                            }});
-                            
-                            // Replace link text with placeholder in the element's text
-                            text = text.replace(linkText, `[LINK:${{linkIndex}}]`);
-                        }}
-                    }});
-                    
-                    structured_text.push({{
-                        tag: el.tagName.toLowerCase(),
-                        text: text
-                    }});
-                }});
-                
-                return {{
-                    structured_text: structured_text,
-                    link_map: link_map
-                }};
-            }}
-        ''')
+        # Removal and extraction run in one evaluate, so the page is only
+        # round-tripped to once
+        result = await page.evaluate(_EXTRACT_JS, [list(_SEMANTIC_TAGS), _REMOVE_SELECTOR])
         
         return result
     
     async def _handle_popups(self, page: Page):
-        cookie_selectors = [
-            'button:has-text("Accept all")',
-            'button:has-text("Accept")',
-            'button:has-text("I agree")',
-            'button:has-text("OK")',
-            '[id*="accept"]',
-            '[class*="accept"]'
-        ]
-        
-        for selector in cookie_selectors:
-            try:
-                button = page.locator(selector).first
-                if await button.count() > 0:
-                    await button.click()
-                    await asyncio.sleep(1)
-                    break
-            except:
-                continue
+        # The selectors are tried in order inside the page and the first
+        # visible match is clicked, all in one evaluate
+        try:
+            clicked = await page.evaluate(_DISMISS_POPUP_JS, [list(_COOKIE_BUTTON_TEXTS), list(_COOKIE_SELECTORS)])
+            if clicked:
+                await asyncio.sleep(1)
+        except:
+            pass
@@ -13,23 +13,18 @@ class Command:
         if not autorecon_path:
             return "Error: AutoRecon not found."
         
-        # Build command: sudo $(which autorecon) <ip>
-        command = f"sudo {autorecon_path} {ip_address}"
+        # sudo $(which autorecon) <ip>, run directly rather than through a
+        # shell; output is captured as bytes and decoded once
+        command = ["sudo", autorecon_path, ip_address]
         
         try:
             process = subprocess.run(
                 command,
-                shell=True,
                 capture_output=True,
-                text=True,
                 check=False
             )
             
-            output = ""
-            if process.stdout:
-                output += process.stdout
-            if process.stderr:
-                output += process.stderr
+            output = (process.stdout + process.stderr).decode('utf-8', 'replace')
             
             results_dir = f"results/{ip_address}"
             
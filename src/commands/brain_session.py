@@ -1,15 +1,37 @@
 import asyncio
 import concurrent.futures
-import yaml
-from src.brain.orchestrator import BrainOrchestrator
+import os
+import traceback
+from src.brain.orchestrator import BrainOrchestrator, load_prompts
 from src.utils.paths import get_absolute_path
 
+# uvloop is optional; it gives the I/O-bound brain loop a cheaper event loop
+try:
+    import uvloop
+except Exception:
+    uvloop = None
+
+
+# Sessions started from inside a running event loop get their own loop on
+# one of these threads; the pool is shared instead of built per call
+_EXEC = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='aida-brain')
+
+
+def _run_async(coro):
+    """asyncio.run, on a uvloop event loop when uvloop is installed."""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
 
 class Command:
     """
     Brain Session command - creates autonomous AI pentester sessions
     """
     
+    # Prompt files by path, with the (mtime_ns, size) they were read at
+    _prompt_file_cache: dict = {}
+    
     def execute(self, params: dict) -> str:
         target = params.get("target")
         if not target:
@@ -23,8 +45,7 @@ class Command:
         # Load brain prompt
         if prompt_file:
             try:
-                with open(get_absolute_path(prompt_file), 'r') as f:
-                    brain_prompt = f.read()
+                brain_prompt = self._read_prompt_file(prompt_file)
             except Exception as e:
                 return f"Error loading prompt file: {e}"
         elif prompt_text:
@@ -38,18 +59,17 @@ class Command:
             try:
                 loop = asyncio.get_running_loop()
                 # We're in an async context - need to run in new thread with new event loop
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(
-                        self._run_brain_session_sync,
-                        target,
-                        goal,
-                        brain_prompt,
-                        max_iterations
-                    )
-                    return future.result()
+                future = _EXEC.submit(
+                    self._run_brain_session_sync,
+                    target,
+                    goal,
+                    brain_prompt,
+                    max_iterations
+                )
+                return future.result()
             except RuntimeError:
                 # No running loop - we can use asyncio.run()
-                return asyncio.run(self._run_brain_session(
+                return _run_async(self._run_brain_session(
                     target=target,
                     goal=goal, 
                     brain_prompt=brain_prompt,
@@ -58,12 +78,14 @@ class Command:
         except KeyboardInterrupt:
             return "🧠 Brain session interrupted by user."
         except Exception as e:
-            import traceback
-            return f"Error running brain session: {e}\n{traceback.format_exc()}"
+            # The full traceback is only formatted when debugging
+            if os.environ.get("AIDA_DEBUG"):
+                return f"Error running brain session: {e}\n{traceback.format_exc()}"
+            return f"Error running brain session: {e!r}"
     
     def _run_brain_session_sync(self, target: str, goal: str, brain_prompt: str, max_iterations: int) -> str:
         """Run brain session in a new event loop (for when called from async context)"""
-        return asyncio.run(self._run_brain_session(target, goal, brain_prompt, max_iterations))
+        return _run_async(self._run_brain_session(target, goal, brain_prompt, max_iterations))
     
     async def _run_brain_session(self, target: str, goal: str, brain_prompt: str, max_iterations: int) -> str:
         """Run the autonomous brain session"""
@@ -76,7 +98,7 @@ class Command:
         print(f"[{timestamp()}] ⏳ Initializing Brain and Worker agents...")
         sys.stdout.flush()
         
-        orchestrator = BrainOrchestrator(
+        orchestrator = await BrainOrchestrator.create(
             target=target,
             goal=goal,
             brain_prompt=brain_prompt,
@@ -89,10 +111,21 @@ class Command:
         result = await orchestrator.run()
         return result
     
+    @classmethod
+    def _read_prompt_file(cls, prompt_file: str) -> str:
+        path = str(get_absolute_path(prompt_file))
+        st = os.stat(path)
+        cached = cls._prompt_file_cache.get(path)
+        if cached and cached[0] == (st.st_mtime_ns, st.st_size):
+            return cached[1]
+        with open(path, 'r') as f:
+            text = f.read()
+        cls._prompt_file_cache[path] = ((st.st_mtime_ns, st.st_size), text)
+        return text
+    
     def _get_default_brain_prompt(self) -> str:
+        # load_prompts is memoized on the file's mtime and size
         try:
-            with open(get_absolute_path("prompts.yaml"), 'r') as f:
-                prompts = yaml.safe_load(f)
-            return prompts.get("brain_agent_system", "You are a Senior Penetration Tester.")
+            return load_prompts().get("brain_agent_system", "You are a Senior Penetration Tester.")
         except Exception as e:
             return "You are a Senior Penetration Tester."
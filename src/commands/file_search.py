@@ -1,7 +1,26 @@
+import collections
+import fnmatch
+import functools
+import itertools
 import os
+import re
 from pathlib import Path
 
 
+@functools.lru_cache(maxsize=128)
+def _compile_pattern(pattern: str):
+    """Case-sensitive matcher for a glob pattern, compiled once per pattern"""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+_HAS_MAGIC = re.compile(r'[*?\[]').search
+
+
+def _skipped(name: str) -> bool:
+    # Hidden entries and common ignored paths
+    return name.startswith('.') or name == '__pycache__'
+
+
 class Command:
     def execute(self, params: dict) -> str:
         pattern = params.get("pattern")
@@ -16,26 +35,12 @@ class Command:
             if not search_path.exists():
                 return f"Error: Directory '{search_dir}' does not exist."
             
-            results = []
-            count = 0
-            
-            # Use rglob for recursive pattern matching
-            for path in search_path.rglob(pattern):
-                if count >= max_results:
-                    results.append(f"\n... (truncated at {max_results} results)")
-                    break
-                
-                # Skip hidden directories and common ignored paths
-                parts = path.parts
-                if any(part.startswith('.') for part in parts) or '__pycache__' in parts:
-                    continue
-                
-                if path.is_file() or path.is_dir():
-                    if path.is_dir():
-                        results.append(str(path) + "/")
-                    else:
-                        results.append(str(path))
-                    count += 1
+            # Patterns with a directory part need rglob's path matching; plain
+            # name patterns use the cheaper scandir walk
+            if '/' in pattern:
+                results = self._rglob_search(search_path, pattern, max_results)
+            else:
+                results = self._scandir_search(str(search_path), pattern, max_results)
             
             if not results:
                 return f"No files matching '{pattern}' found in {search_path}"
@@ -44,3 +49,71 @@ class Command:
             
         except Exception as e:
             return f"Error searching for files: {str(e)}"
+    
+    def _scandir_search(self, root: str, pattern: str, max_results: int) -> list:
+        # One match past the cap tells whether to add the truncation note;
+        # the walk is lazy, so nothing beyond that match is listed
+        results = list(itertools.islice(self._walk(root, pattern), max_results + 1))
+        if len(results) > max_results:
+            results[max_results:] = [f"\n... (truncated at {max_results} results)"]
+        return results
+    
+    def _walk(self, root: str, pattern: str):
+        # A pattern without wildcards can only match its own name exactly
+        matches = _compile_pattern(pattern) if _HAS_MAGIC(pattern) else pattern.__eq__
+        
+        # Breadth-first walk over DirEntry objects, so shallow matches come
+        # first: the file type comes from the directory listing, so matches
+        # cost no extra stat() and no Path objects are built
+        queue = collections.deque([root])
+        while queue:
+            try:
+                it = os.scandir(queue.popleft())
+            except OSError:
+                # Unreadable or vanished directories are skipped, as rglob does
+                continue
+            
+            with it:
+                for entry in it:
+                    name = entry.name
+                    if _skipped(name):
+                        continue
+                    
+                    try:
+                        is_dir = entry.is_dir()
+                        if is_dir and not entry.is_symlink():
+                            queue.append(entry.path)
+                        
+                        if not matches(name):
+                            continue
+                        is_file = not is_dir and entry.is_file()
+                    except OSError:
+                        continue
+                    
+                    if is_dir:
+                        yield entry.path + "/"
+                    elif is_file:
+                        yield entry.path
+    
+    def _rglob_search(self, search_path: Path, pattern: str, max_results: int) -> list:
+        results = []
+        count = 0
+        
+        for path in search_path.rglob(pattern):
+            if count >= max_results:
+                results.append(f"\n... (truncated at {max_results} results)")
+                break
+            
+            # Skip hidden directories and common ignored paths below the
+            # search directory
+            if any(_skipped(part) for part in path.relative_to(search_path).parts):
+                continue
+            
+            if path.is_dir():
+                results.append(str(path) + "/")
+                count += 1
+            elif path.is_file():
+                results.append(str(path))
+                count += 1
+        
+        return results
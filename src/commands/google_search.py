@@ -1,7 +1,7 @@
-import asyncio
 import json
 import sys
 import os
+import threading
 
 # Add the parent directory to the path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,23 +9,33 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from browser import GoogleSearch
+from browser import GoogleSearch, run_coro, run_coro_async
+
+_searcher = None
+_searcher_lock = threading.Lock()
+
+def _get_searcher() -> GoogleSearch:
+    global _searcher
+    with _searcher_lock:
+        if _searcher is None:
+            _searcher = GoogleSearch(headless=True)
+        return _searcher
 
 class Command:
     def execute(self, params: dict) -> str:
+        return run_coro(self.execute_async(params))
+    
+    async def execute_async(self, params: dict) -> str:
         query = params.get("query")
         
         if not query:
             return json.dumps({"error": "'query' parameter is required"})
         
         try:
-            searcher = GoogleSearch(headless=True)
+            searcher = _get_searcher()
             
-            # Always run in a separate thread to avoid event loop conflicts
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, searcher.execute(query, 20))
-                results = future.result(timeout=60)
+            # Runs on the shared browser loop, so the pooled browser is reused
+            results = await run_coro_async(searcher.execute(query, 20), timeout=60)
             
             structured_results = []
             for i, result in enumerate(results, 1):
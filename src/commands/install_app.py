@@ -1,4 +1,11 @@
+import os
+import selectors
+import signal
 import subprocess
+import time
+from collections import deque
+
+TAIL_LINES = 200
 
 class Command:
     def execute(self, params: dict) -> str:
@@ -28,23 +35,15 @@ class Command:
                 "DEBIAN_FRONTEND": "noninteractive"
             }
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300,
-                env=env
-            )
+            returncode, tail = self._run_streaming(cmd, env, timeout=300)
             
             output = ""
-            if result.stdout:
-                output += f"STDOUT:\n{result.stdout.strip()}\n"
-            if result.stderr:
-                output += f"STDERR:\n{result.stderr.strip()}\n"
+            if tail:
+                output += f"OUTPUT (last {TAIL_LINES} lines):\n" + "\n".join(tail) + "\n"
             
-            output += f"Return Code: {result.returncode}"
+            output += f"Return Code: {returncode}"
             
-            if result.returncode == 0:
+            if returncode == 0:
                 output += f"\n\nSuccessfully installed: {', '.join(package_list)}"
             else:
                 output += f"\n\nFailed to install: {', '.join(package_list)}"
@@ -55,3 +54,73 @@ class Command:
             return "Error: Installation timed out after 300 seconds."
         except Exception as e:
             return f"Error installing packages: {str(e)}"
+    
+    def _run_streaming(self, cmd: list, env: dict, timeout: float):
+        """
+        Streams apt's combined output, keeping only the last TAIL_LINES lines
+        so a chatty install never builds up in memory.
+        """
+        # A session of its own lets a timeout signal sudo and apt together
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=env,
+            start_new_session=True
+        )
+        deadline = time.monotonic() + timeout
+        tail = deque(maxlen=TAIL_LINES)
+        
+        # The pipe is read raw behind a selector, so the deadline holds even
+        # while apt is silent or holds the pipe open after sudo has gone
+        fd = proc.stdout.fileno()
+        pending = b""
+        try:
+            with selectors.DefaultSelector() as sel:
+                sel.register(fd, selectors.EVENT_READ)
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not sel.select(timeout=remaining):
+                        self._stop(proc)
+                        raise subprocess.TimeoutExpired(cmd, timeout)
+                    
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        break
+                    *lines, pending = (pending + chunk).split(b"\n")
+                    self._keep(tail, lines)
+            self._keep(tail, [pending])
+            
+            try:
+                returncode = proc.wait(max(deadline - time.monotonic(), 0))
+            except subprocess.TimeoutExpired:
+                self._stop(proc)
+                raise
+        finally:
+            proc.stdout.close()
+        
+        return returncode, tail
+    
+    @staticmethod
+    def _keep(tail: deque, lines: list) -> None:
+        for raw in lines:
+            line = raw.decode("utf-8", "replace").rstrip()
+            if line:
+                tail.append(line)
+    
+    @staticmethod
+    def _stop(proc: subprocess.Popen) -> None:
+        # SIGTERM to the whole group reaches apt directly, and sudo relays it
+        # as well; escalate to SIGKILL if they don't exit promptly
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except OSError:
+            proc.terminate()
+        try:
+            proc.wait(5)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except OSError:
+                proc.kill()
+            proc.wait()
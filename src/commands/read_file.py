@@ -1,3 +1,6 @@
+from itertools import islice
+
+
 class Command:
     def execute(self, params: dict) -> str:
         file_path = params.get("file_path")
@@ -5,19 +8,19 @@ class Command:
         max_lines = params.get("max_lines", 200)
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                content_lines = list(islice(f, start_line - 1, start_line - 1 + max_lines))
+                has_more = next(f, None) is not None
             
-            end_line = min(start_line + max_lines - 1, len(lines))
-            content_lines = lines[start_line-1:end_line]
+            end_line = start_line + len(content_lines) - 1
             
-            result = f"=== {file_path} (lines {start_line}-{end_line}) ===\n"
-            result += ''.join(content_lines)
+            parts = [f"=== {file_path} (lines {start_line}-{end_line}) ===\n"]
+            parts.extend(content_lines)
             
-            if end_line < len(lines):
-                result += f"\n... ({len(lines) - end_line} more lines available)"
+            if has_more:
+                parts.append(f"\n... (more lines available from line {end_line + 1})")
             
-            return result
+            return ''.join(parts)
             
         except Exception as e:
             return f"Error reading {file_path}: {str(e)}"
@@ -1,6 +1,10 @@
-import asyncio
+import functools
 import sys
 import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
 
 # Add the parent directory to the path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,29 +12,80 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
-from browser import WebpageFetcher
+from browser import WebpageFetcher, run_coro, run_coro_async
+
+# Recently read URLs -> (expires_at, output_file, response). Pages of the same
+# domain share an output file, so reading one drops the others' entries.
+CACHE_TTL = 300
+CACHE_MAX_ENTRIES = 128
+_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+def _get_fetcher() -> WebpageFetcher:
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = WebpageFetcher(headless=True)
+        return _fetcher
+
+# Always save to /tmp/html-results/. The directory is created on first use
+# and again only after a failed fetch, in case it was cleaned up meanwhile.
+HTML_DIR = "/tmp/html-results"
+_html_dir_ready = False
+
+@functools.lru_cache(maxsize=256)
+def _domain_slug(netloc: str) -> str:
+    return netloc.replace('www.', '').replace('.', '_')
+
+def _cache_get(url: str):
+    with _cache_lock:
+        entry = _cache.get(url)
+        if entry is None:
+            return None
+        expires_at, output_file, response = entry
+        if expires_at < time.monotonic() or not os.path.exists(output_file):
+            del _cache[url]
+            return None
+        _cache.move_to_end(url)
+        return response
+
+def _cache_put(url: str, output_file: str, response: str):
+    with _cache_lock:
+        for other in [u for u, entry in _cache.items() if entry[1] == output_file]:
+            del _cache[other]
+        _cache[url] = (time.monotonic() + CACHE_TTL, output_file, response)
+        if len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
 
 class Command:
     def execute(self, params: dict) -> str:
+        return run_coro(self.execute_async(params))
+    
+    async def execute_async(self, params: dict) -> str:
+        global _html_dir_ready
         url = params.get("url")
         
         if not url:
             return "Error: 'url' parameter is required"
         
+        if not params.get("no_cache"):
+            cached = _cache_get(url)
+            if cached is not None:
+                return cached
+        
         try:
-            fetcher = WebpageFetcher(headless=True)
+            fetcher = _get_fetcher()
             
-            # Always save to /tmp/html-results/
-            os.makedirs("/tmp/html-results", exist_ok=True)
-            from urllib.parse import urlparse
-            domain = urlparse(url).netloc.replace('www.', '').replace('.', '_')
-            output_file = f"/tmp/html-results/{domain}.html"
+            if not _html_dir_ready:
+                os.makedirs(HTML_DIR, exist_ok=True)
+                _html_dir_ready = True
+            output_file = f"{HTML_DIR}/{_domain_slug(urlparse(url).netloc)}.html"
             
-            # Always run in a separate thread to avoid event loop conflicts
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, fetcher.execute(url, output_file))
-                result = future.result(timeout=60)
+            # Runs on the shared browser loop, so the pooled browser is reused
+            result = await run_coro_async(fetcher.execute(url, output_file), timeout=60)
             
             format_explanation = """
 STRUCTURED JSON FORMAT:
@@ -44,7 +99,10 @@ USEFUL JQ QUERIES for run_command tool:
 - Get paragraphs: jq '.structured_text[] | select(.tag == "p") | .text' file.json
 """
             
-            return f"Successfully fetched {url} (Status: {result['status_code']})\nHTML saved to: {result['html_file']}\nStructured content saved to: {result['structured_file']}\nExtracted {result['text_elements']} text elements and {result['links_found']} links\n{format_explanation}"
+            response = f"Successfully fetched {url} (Status: {result['status_code']})\nHTML saved to: {result['html_file']}\nStructured content saved to: {result['structured_file']}\nExtracted {result['text_elements']} text elements and {result['links_found']} links\n{format_explanation}"
+            _cache_put(url, output_file, response)
+            return response
             
         except Exception as e:
+            _html_dir_ready = False
             return f"Error fetching webpage: {str(e)}"
@@ -2,6 +2,7 @@ import os
 import sys
 import subprocess
 import shutil
+import stat
 from datetime import datetime
 from pathlib import Path
 
@@ -49,9 +50,12 @@ class Command:
     
     def _create_backup(self, project_root: str) -> None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_dir = os.path.join(project_root, "tmp", f"backup_{timestamp}")
+        backup_root = os.path.join(project_root, "tmp")
+        backup_dir = os.path.join(backup_root, f"backup_{timestamp}")
+        previous_dir = self._latest_backup(backup_root)
         
         os.makedirs(backup_dir, exist_ok=True)
+        copy = self._link_or_copy(previous_dir, backup_dir)
         
         # Backup critical files
         files_to_backup = [
@@ -64,13 +68,48 @@ class Command:
         
         for item in files_to_backup:
             src_path = os.path.join(project_root, item)
-            if os.path.exists(src_path):
-                dst_path = os.path.join(backup_dir, item)
-                
-                if os.path.isdir(src_path):
-                    shutil.copytree(src_path, dst_path, dirs_exist_ok=True)
-                else:
-                    os.makedirs(os.path.dirname(dst_path), exist_ok=True)
-                    shutil.copy2(src_path, dst_path)
+            try:
+                st = os.stat(src_path)
+            except FileNotFoundError:
+                continue
+            
+            dst_path = os.path.join(backup_dir, item)
+            
+            if stat.S_ISDIR(st.st_mode):
+                shutil.copytree(src_path, dst_path, copy_function=copy, dirs_exist_ok=True)
+            else:
+                os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+                copy(src_path, dst_path)
         
         print(f"💾 Backup created: {backup_dir}")
+    
+    def _latest_backup(self, backup_root: str):
+        try:
+            names = [n for n in os.listdir(backup_root) if n.startswith("backup_")]
+        except FileNotFoundError:
+            return None
+        return os.path.join(backup_root, max(names)) if names else None
+    
+    def _link_or_copy(self, previous_dir, backup_dir: str):
+        """
+        Returns a copy function that hardlinks a file to its twin in the
+        previous backup when it is unchanged since then, and copies it
+        otherwise. Links only ever point between backups, never at the live
+        tree, so later in-place edits can't alter a backup.
+        """
+        def copy(src, dst):
+            if previous_dir is not None and previous_dir != backup_dir:
+                prev = os.path.join(previous_dir, os.path.relpath(dst, backup_dir))
+                try:
+                    src_st = os.stat(src)
+                    prev_st = os.stat(prev)
+                    # copy2 preserves mtime, so an unchanged file matches exactly
+                    if (src_st.st_size == prev_st.st_size
+                            and src_st.st_mtime_ns == prev_st.st_mtime_ns):
+                        os.link(prev, dst)
+                        return dst
+                except OSError:
+                    pass
+            return shutil.copy2(src, dst)
+        
+        return copy
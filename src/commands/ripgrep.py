@@ -1,5 +1,37 @@
+import json
 import subprocess
 import os
+import tempfile
+import threading
+
+# orjson decodes rg's JSON lines several times faster than the stdlib; fall
+# back to stdlib json when it isn't installed.
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _parse_match(line: str):
+    """Condense an rg --json match event to its path, line number and text"""
+    event = _loads(line)
+    if event.get("type") != "match":
+        return None
+    data = event["data"]
+    # Non-UTF-8 paths and lines come base64-encoded under "bytes" instead
+    return {
+        "path": data["path"].get("text"),
+        "line_number": data.get("line_number"),
+        "lines": data["lines"].get("text")
+    }
+
+
+def _dumps(matches: list) -> str:
+    if orjson is not None:
+        return orjson.dumps(matches, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(matches, indent=2, ensure_ascii=False)
 
 class Command:
     def execute(self, params: dict) -> str:
@@ -28,7 +60,15 @@ class Command:
         if not os.path.exists(search_directory):
             return f"Error: Search directory '{search_directory}' does not exist."
         
-        cmd = ["rg", "--json"]
+        # rg also stops after max_count matches in each file. When only file
+        # names are wanted, rg lists them directly instead of encoding every
+        # match as JSON.
+        files_only = params.get("files_only", False)
+        parsed = params.get("parsed", False) and not files_only
+        if files_only:
+            cmd = ["rg", "--files-with-matches"]
+        else:
+            cmd = ["rg", "--json", "--max-count", str(max_count)]
         
         # Add file extension filter (now required)
         cmd.extend(["-g", f"*.{extension}"])
@@ -37,33 +77,75 @@ class Command:
         cmd.append(search_directory)
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            parse = _parse_match if parsed else None
+            output_lines, truncated, returncode, stderr = self._run_rg(cmd, max_count, parse=parse)
             
-            if result.returncode == 1:
+            if returncode == 1:
                 return "No matches found."
-            elif result.returncode != 0:
-                return f"Error: {result.stderr.strip()}"
-            
-            # Limit output to max_count lines to control response size
-            output_lines = result.stdout.strip().split('\n')
+            elif returncode != 0:
+                return f"Error: {stderr.strip()}"
             
             # Add search parameters info for transparency
             search_info = f"=== Ripgrep Search Results ===\nPattern: '{pattern}' | Directory: '{search_directory}' | Extension: '*.{extension}' | Max results: {max_count}\n\n"
             
-            if len(output_lines) > max_count:
-                limited_lines = output_lines[:max_count]
-                return search_info + '\n'.join(limited_lines) + f"\n\n... (truncated to {max_count} lines out of {len(output_lines)} total matches)"
+            if parsed:
+                if truncated:
+                    return search_info + _dumps(output_lines) + f"\n\n... (truncated to {max_count} matches)"
+                return search_info + _dumps(output_lines)
+            
+            if truncated:
+                return search_info + ''.join(output_lines).rstrip('\n') + f"\n\n... (truncated to {max_count} lines)"
             
-            return search_info + result.stdout
+            return search_info + ''.join(output_lines)
             
         except FileNotFoundError:
             return "Error: ripgrep (rg) not found. Please install ripgrep."
         except subprocess.TimeoutExpired:
             return "Error: Search timed out."
         except Exception as e:
-            return f"Error: {str(e)}"
\ No newline at end of file
+            return f"Error: {str(e)}"
+    
+    def _run_rg(self, cmd: list, max_count: int, timeout: float = 30, parse=None):
+        """
+        Streams rg's output and stops it once max_count lines have been read,
+        so a large search is never buffered in full. With parse, each line is
+        parsed as it arrives and only its non-None results are kept and
+        counted. Returns (lines, truncated, returncode, stderr); returncode is
+        0 when truncated.
+        """
+        # stderr goes to a temporary file so a flood of warnings can't fill
+        # the pipe and stall rg while stdout is being read
+        with tempfile.TemporaryFile() as err:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err, text=True)
+            timed_out = threading.Event()
+            
+            def kill():
+                timed_out.set()
+                proc.kill()
+            
+            timer = threading.Timer(timeout, kill)
+            timer.start()
+            try:
+                lines = []
+                truncated = False
+                for line in proc.stdout:
+                    if parse is not None:
+                        line = parse(line)
+                        if line is None:
+                            continue
+                    if len(lines) >= max_count:
+                        truncated = True
+                        proc.terminate()
+                        break
+                    lines.append(line)
+                proc.stdout.close()
+                returncode = proc.wait()
+            finally:
+                timer.cancel()
+            
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            if truncated:
+                return lines, True, 0, ""
+            err.seek(0)
+            return lines, False, returncode, err.read().decode('utf-8', 'replace')
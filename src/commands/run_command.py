@@ -1,5 +1,30 @@
 import subprocess
 
+# Commands free of these characters are plain argv lists and can be exec'd
+# without a /bin/sh in between
+_SHELL_META = frozenset('|&;<>()$`\\"\'\n*?[]{}~!#')
+# Builtins and keywords have no executable (or one that behaves differently,
+# like echo), so they always go through the shell
+_SHELL_BUILTINS = frozenset([
+    "cd", "export", "source", ".", "alias", "unalias", "unset", "set", "exit",
+    "eval", "exec", "ulimit", "umask", "read", "type", "wait", "trap", "shift",
+    "return", "command", "hash", "times", "readonly", "local", "echo",
+    "printf", "pwd", "jobs", "fg", "bg", "getopts", "break", "continue",
+    "time", "if", "for", "while", "until", "case", "function"
+])
+
+
+def _plain_argv(command: str):
+    """The command's argv if it needs no shell features, else None"""
+    if not _SHELL_META.isdisjoint(command):
+        return None
+    argv = command.split()
+    # A leading NAME=value is a variable assignment, not a program
+    if not argv or argv[0] in _SHELL_BUILTINS or '=' in argv[0]:
+        return None
+    return argv
+
+
 class Command:
     """
     This class is dynamically loaded by the ToolExecutor.
@@ -26,16 +51,7 @@ class Command:
         run_in_directory = params.get("run_in_directory")
         
         try:
-            # Always use shell=True - simple and works with all commands
-            process = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                check=False,
-                timeout=params.get("timeout", 30),
-                cwd=run_in_directory
-            )
+            process = self._run(command, params.get("timeout", 30), run_in_directory)
             
             output = ""
             if process.stdout:
@@ -60,3 +76,31 @@ class Command:
             return f"Error: The command timed out after {timeout_val} seconds."
         except Exception as e:
             return f"An unexpected error occurred while running the command: {str(e)}"
+    
+    def _run(self, command: str, timeout, cwd) -> subprocess.CompletedProcess:
+        argv = _plain_argv(command)
+        if argv is not None:
+            try:
+                # Spawned directly, skipping the intermediate shell process
+                return subprocess.run(
+                    argv,
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                    timeout=timeout,
+                    cwd=cwd
+                )
+            except (FileNotFoundError, PermissionError, NotADirectoryError):
+                # Let the shell report a missing or non-executable program
+                # exactly as it always has
+                pass
+        
+        return subprocess.run(
+            command,
+            shell=True,
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=timeout,
+            cwd=cwd
+        )
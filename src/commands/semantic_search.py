@@ -1,9 +1,22 @@
+import functools
+
 import chromadb.utils.embedding_functions as embedding_functions
 
 from src.rag.vector_store import VectorStore
 from src.utils.paths import get_absolute_path
 
 
+@functools.lru_cache(maxsize=1)
+def _get_store() -> VectorStore:
+    # The default embedder loads its model on construction, so the store is
+    # built once and shared by every search
+    return VectorStore(
+        db_path=str(get_absolute_path("db")),
+        collection_name="codebase",
+        embedding_function=embedding_functions.DefaultEmbeddingFunction()
+    )
+
+
 class Command:
     def execute(self, params: dict) -> str:
         query = params.get("query")
@@ -13,14 +26,7 @@ class Command:
         top_k = params.get("top_k", 5)
         
         try:
-            embedding_function = embedding_functions.DefaultEmbeddingFunction()
-            vector_store = VectorStore(
-                db_path=str(get_absolute_path("db")),
-                collection_name="codebase",
-                embedding_function=embedding_function
-            )
-            
-            chunks = vector_store.query(query, top_k=top_k)
+            chunks = _get_store().query(query, top_k=top_k)
             
             if not chunks:
                 return "No relevant code snippets found for your query."
@@ -1,8 +1,17 @@
+import os
+import re
+import selectors
 import subprocess
 import threading
 import time
 from pathlib import Path
 
+_FAIL_RE = re.compile(
+    r"auth failed|authentication failed|connection refused|network unreachable"
+    r"|tls handshake failed|certificate verify failed",
+    re.IGNORECASE
+)
+
 
 class Command:
     def execute(self, params: dict) -> str:
@@ -19,41 +28,52 @@ class Command:
             process = subprocess.Popen(
                 ["sudo", "openvpn", "--config", str(config_path)],
                 stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
+                stderr=subprocess.STDOUT
             )
             
             # Monitor output for success/failure
             success = False
             output_lines = []
-            start_time = time.time()
-            timeout = 30  # 30 second timeout
+            deadline = time.monotonic() + 30  # 30 second timeout
             
-            while time.time() - start_time < timeout:
-                line = process.stdout.readline()
-                if line:
-                    output_lines.append(line.strip())
-                    
-                    # Check for success indicator
-                    if "Initialization Sequence Completed" in line:
-                        success = True
+            # Wake on output as soon as it arrives. The pipe is read raw, since
+            # a buffered readline() can hold lines the selector never reports.
+            fd = process.stdout.fileno()
+            sel = selectors.DefaultSelector()
+            sel.register(fd, selectors.EVENT_READ)
+            pending = b""
+            done = False
+            
+            try:
+                while not done:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not sel.select(timeout=remaining):
                         break
                     
-                    # Check for common failure indicators
-                    if any(fail_str in line.lower() for fail_str in [
-                        "auth failed", "authentication failed", 
-                        "connection refused", "network unreachable",
-                        "tls handshake failed", "certificate verify failed"
-                    ]):
-                        break
-                
-                # Check if process has terminated
-                if process.poll() is not None:
-                    break
-                
-                time.sleep(0.1)
+                    chunk = os.read(fd, 4096)
+                    if chunk:
+                        *lines, pending = (pending + chunk).split(b"\n")
+                    else:
+                        # EOF: the process has exited
+                        lines = [pending] if pending else []
+                        done = True
+                    
+                    for raw in lines:
+                        line = raw.decode("utf-8", "replace")
+                        output_lines.append(line.strip())
+                        
+                        # Check for success indicator
+                        if "Initialization Sequence Completed" in line:
+                            success = True
+                            done = True
+                            break
+                        
+                        # Check for common failure indicators
+                        if _FAIL_RE.search(line):
+                            done = True
+                            break
+            finally:
+                sel.close()
             
             if success:
                 # Kill the process since we just wanted to test connection
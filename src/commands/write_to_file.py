@@ -16,9 +16,10 @@ class Command:
             # Create parent directories if they don't exist
             path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Write content to file
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # Encode once and write the bytes straight through, skipping the
+            # text layer's own buffering and chunked encoding
+            with open(path, 'wb') as f:
+                f.write(content.encode('utf-8'))
             
             return f"Successfully wrote {len(content)} characters to {file_path}"
             
@@ -1,11 +1,11 @@
 import os
-import yaml
 from pathlib import Path
 from dataclasses import asdict
 from dotenv import load_dotenv
 
 from src.llm.types import LLMConfig
 from src.utils.paths import get_absolute_path
+from src.utils.yaml_loader import safe_load
 
 
 class AppSettings:
@@ -16,7 +16,7 @@ class AppSettings:
         raise FileNotFoundError(f"Configuration file not found at: {_config_path}")
 
     with open(_config_path, "r") as f:
-        _yaml = yaml.safe_load(f) or {}
+        _yaml = safe_load(f) or {}
 
     if "llm_configs" not in _yaml or "llm_providers" not in _yaml:
         raise ValueError("'config.yaml' is missing 'llm_configs' or 'llm_providers'.")
@@ -78,7 +78,10 @@ class AppSettings:
     BRAIN_MAX_ITERATIONS = int(os.getenv("BRAIN_MAX_ITERATIONS", _brain_config.get("max_iterations", 50)))
     BRAIN_DEFAULT_GOAL = os.getenv("BRAIN_DEFAULT_GOAL", _brain_config.get("default_goal", "Complete penetration test"))
     BRAIN_DETAILED_LOGGING = os.getenv("BRAIN_DETAILED_LOGGING", str(_brain_config.get("enable_detailed_logging", True))).lower() == 'true'
+    BRAIN_DEBUG_EXTRACTION = os.getenv("BRAIN_DEBUG_EXTRACTION", str(_brain_config.get("debug_extraction", False))).lower() == 'true'
     BRAIN_PAUSE_ITERATIONS = int(os.getenv("BRAIN_PAUSE_ITERATIONS", _brain_config.get("pause_between_iterations", 1)))
+    BRAIN_MAX_CALLS_PER_MINUTE = int(os.getenv("BRAIN_MAX_CALLS_PER_MINUTE", _brain_config.get("max_calls_per_minute", 60)))
+    BRAIN_LLM_CACHE = os.getenv("BRAIN_LLM_CACHE", str(_brain_config.get("llm_cache", False))).lower() == 'true'
 
 
     # Default LLM_CONFIG (uses agent_llm configuration)
@@ -0,0 +1,121 @@
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from openai.types.chat import ChatCompletion
+
+from src.llm.client import LLMClient
+from src.trace.events import EventSink, TaskEvent
+
+# diskcache lets cached responses survive across sessions; without it the
+# cache only lives for the current process.
+try:
+    import diskcache
+except Exception:
+    diskcache = None
+
+
+class CachingLLMClient:
+    """
+    Exact-match response cache in front of an LLMClient, keyed by a hash of
+    the model, messages and tools. Only deterministic configs (temperature 0)
+    are cached unless cache_sampled is set; otherwise anything sampled at a
+    higher temperature is passed through and no cache is opened.
+    """
+
+    def __init__(
+        self,
+        real_client: LLMClient,
+        event_sink: Optional[EventSink] = None,
+        trace_id: str = "",
+        cache_dir: Optional[str] = None,
+        max_entries: int = 256,
+        cache_sampled: bool = False
+    ):
+        self.real_client = real_client
+        self.config = real_client.config
+        self.event_sink = event_sink
+        self.trace_id = trace_id
+        self.max_entries = max_entries
+        self.cache_sampled = cache_sampled
+        self.hits = 0
+        self.misses = 0
+        self._disk = None
+        if self.enabled and diskcache is not None and cache_dir:
+            self._disk = diskcache.Cache(cache_dir)
+        self._memory: "OrderedDict[str, ChatCompletion]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        if self.cache_sampled:
+            return True
+        return self.config.temperature is not None and self.config.temperature <= 0
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def _key(self, messages: list, tools: Optional[list]) -> str:
+        payload = json.dumps(
+            {"model": self.config.model, "messages": messages, "tools": tools},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _get(self, key: str) -> Optional[ChatCompletion]:
+        if self._disk is not None:
+            return self._disk.get(key)
+        response = self._memory.get(key)
+        if response is not None:
+            self._memory.move_to_end(key)
+        return response
+
+    def _set(self, key: str, response: ChatCompletion) -> None:
+        if self._disk is not None:
+            self._disk.set(key, response)
+            return
+        self._memory[key] = response
+        if len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _emit(self, event_type: str, key: str) -> None:
+        if self.event_sink is None:
+            return
+        self.event_sink.emit(TaskEvent(
+            event_type=event_type,
+            trace_id=self.trace_id,
+            timestamp=datetime.now(),
+            data={
+                "key": key,
+                "model": self.config.model,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+        ))
+
+    async def get_response(
+        self,
+        messages: list,
+        tools: list = None,
+        prompt_cache_key: Optional[str] = None
+    ) -> Optional[ChatCompletion]:
+        if not self.enabled:
+            return await self.real_client.get_response(messages, tools, prompt_cache_key=prompt_cache_key)
+
+        key = self._key(messages, tools)
+        response = self._get(key)
+        if response is not None:
+            self.hits += 1
+            self._emit("llm_cache_hit", key)
+            return response
+
+        self.misses += 1
+        self._emit("llm_cache_miss", key)
+        response = await self.real_client.get_response(messages, tools, prompt_cache_key=prompt_cache_key)
+        if response is not None:
+            self._set(key, response)
+        return response
@@ -1,5 +1,7 @@
+import functools
 import time
 from typing import Dict, Any, Optional, Type, TypeVar
+import httpx
 from pydantic import BaseModel
 
 from openai import AsyncOpenAI
@@ -11,21 +13,73 @@ from src.llm.types import LLMConfig
 T = TypeVar('T', bound=BaseModel)
 
 
+@functools.lru_cache(maxsize=None)
+def strict_json_schema(response_format: Type[BaseModel]) -> Dict[str, Any]:
+    """JSON schema for a structured-output model with additionalProperties disabled, built once per model"""
+    schema = response_format.model_json_schema()
+    
+    def add_additional_properties(obj):
+        if isinstance(obj, dict):
+            if obj.get("type") == "object":
+                obj["additionalProperties"] = False
+            for value in obj.values():
+                add_additional_properties(value)
+        elif isinstance(obj, list):
+            for item in obj:
+                add_additional_properties(item)
+    
+    add_additional_properties(schema)
+    return schema
+
+
 class LLMClient:
-    def __init__(self, config: Optional[LLMConfig] = None, logger=None):
+    def __init__(self, config: Optional[LLMConfig] = None, logger=None,
+                 http_client: Optional[httpx.AsyncClient] = None):
         self.config = config or AppSettings.LLM_CONFIG
         self.logger = logger
+        # Clients built with the same http_client share its connection pool, so
+        # calls to the same provider host reuse keep-alive connections.
         self._client = AsyncOpenAI(
             api_key=self.config.api_key,
             base_url=self.config.base_url,
             timeout=self.config.timeout,
             max_retries=self.config.max_retries,
+            http_client=http_client,
         )
 
+    def _apply_prompt_caching(self, messages: list) -> list:
+        """
+        Marks stable prompt prefixes as cacheable for Anthropic models, which
+        only cache prefixes that end in an explicit cache_control marker: the
+        leading system prompt and any message built with a cache_hint. OpenAI
+        models cache repeated prefixes automatically, so the hint is dropped.
+        """
+        model = self.config.model.lower()
+        anthropic = "anthropic/" in model or "claude" in model
+        if not anthropic and not any("cache_hint" in m for m in messages):
+            return messages
+        
+        prepared = []
+        for i, message in enumerate(messages):
+            hinted = message.get("cache_hint", False)
+            if hinted:
+                message = {k: v for k, v in message.items() if k != "cache_hint"}
+            cacheable = hinted or (i == 0 and message.get("role") == "system")
+            if anthropic and cacheable and isinstance(message.get("content"), str):
+                message = dict(message)
+                message["content"] = [{
+                    "type": "text",
+                    "text": message["content"],
+                    "cache_control": {"type": "ephemeral"}
+                }]
+            prepared.append(message)
+        return prepared
+
     async def get_response(
         self,
         messages: list,
-        tools: list = None
+        tools: list = None,
+        prompt_cache_key: Optional[str] = None
     ) -> Optional[ChatCompletion]:
         """
         Gets a full response object from the LLM, including all metadata.
@@ -33,15 +87,20 @@ class LLMClient:
         Args:
             messages: A list of messages forming the conversation history.
             tools: An optional list of tools to provide to the LLM.
+            prompt_cache_key: An optional stable key (e.g. a session id) that lets
+                the provider route requests sharing a prompt prefix to the same cache.
 
         Returns:
             The raw ChatCompletion object from the OpenAI API, or None on failure.
         """
         params = {
             "model": self.config.model,
-            "messages": messages,
+            "messages": self._apply_prompt_caching(messages),
         }
         
+        if prompt_cache_key:
+            params["extra_body"] = {"prompt_cache_key": prompt_cache_key}
+        
         # Add model-specific parameters if they exist in the config
         if self.config.temperature is not None:
             params["temperature"] = self.config.temperature
@@ -117,27 +176,15 @@ class LLMClient:
         self,
         messages: list,
         response_format: Type[T],
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        schema: Optional[Dict[str, Any]] = None
     ) -> Optional[T]:
-        import json
-        
-        schema = response_format.model_json_schema()
-        
-        def add_additional_properties(obj):
-            if isinstance(obj, dict):
-                if obj.get("type") == "object":
-                    obj["additionalProperties"] = False
-                for value in obj.values():
-                    add_additional_properties(value)
-            elif isinstance(obj, list):
-                for item in obj:
-                    add_additional_properties(item)
-        
-        add_additional_properties(schema)
+        if schema is None:
+            schema = strict_json_schema(response_format)
         
         params = {
             "model": self.config.model,
-            "messages": messages,
+            "messages": self._apply_prompt_caching(messages),
             "response_format": {
                 "type": "json_schema",
                 "json_schema": {
@@ -167,8 +214,7 @@ class LLMClient:
                 self.logger.log_api_call(duration, response.model, response.usage)
             
             content = response.choices[0].message.content
-            data = json.loads(content)
-            return response_format(**data)
+            return response_format.model_validate_json(content)
         except Exception as e:
             if self.logger:
                 self.logger.log_error("Error parsing structured output", e)
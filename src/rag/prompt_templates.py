@@ -1,8 +1,8 @@
-import yaml
 from pathlib import Path
 from typing import Dict, Any
 
 from src.utils.paths import get_absolute_path
+from src.utils.yaml_loader import safe_load
 
 
 class PromptTemplateManager:
@@ -18,7 +18,7 @@ class PromptTemplateManager:
             raise FileNotFoundError(f"Prompt template file not found: {self.file_path}")
         
         with open(self.file_path, 'r') as f:
-            data = yaml.safe_load(f)
+            data = safe_load(f)
             if not isinstance(data, dict):
                 raise ValueError(f"Invalid prompt template file format: {self.file_path}")
             return data
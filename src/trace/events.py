@@ -1,9 +1,18 @@
+import asyncio
+import collections
 import json
 import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+# orjson serializes events several times faster than the stdlib; fall back to
+# compact stdlib json when it isn't installed.
+try:
+    import orjson
+except Exception:
+    orjson = None
 
 
 @dataclass
@@ -38,6 +47,28 @@ class TaskEvent:
         )
 
 
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    # Containers neither orjson nor json encode natively serialize as arrays
+    # rather than their repr
+    if isinstance(obj, (set, frozenset, collections.deque)):
+        return list(obj)
+    return str(obj)
+
+
+def serialize_event(event: TaskEvent) -> bytes:
+    """Encode an event as one newline-terminated JSON line."""
+    event_dict = event.to_dict()
+    if orjson is not None:
+        return orjson.dumps(
+            event_dict,
+            default=_json_default,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        )
+    return (json.dumps(event_dict, separators=(',', ':'), default=_json_default) + '\n').encode('utf-8')
+
+
 class EventSink(ABC):
     @abstractmethod
     def emit(self, event: TaskEvent) -> None:
@@ -48,8 +79,88 @@ class FileEventSink(EventSink):
     def __init__(self, file_path: str):
         self.file_path = file_path
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        self._fd: Optional[int] = None
+    
+    def emit(self, event: TaskEvent) -> None:
+        # The file is opened on first emit (so idle sessions leave no empty trace)
+        # and written through a raw append-only descriptor, skipping the
+        # TextIOWrapper encode layer.
+        self.write(serialize_event(event))
+    
+    def write(self, data: bytes) -> None:
+        if self._fd is None:
+            self._fd = os.open(self.file_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        data = memoryview(data)
+        while data:
+            written = os.write(self._fd, data)
+            data = data[written:]
+    
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class AsyncFileEventSink(EventSink):
+    """FileEventSink whose writes happen in batches on a background task.
+    
+    emit() only serializes the event (so later mutations of its data don't
+    leak into the trace) and queues it; call flush() before the loop exits.
+    Outside a running event loop it writes synchronously.
+    """
+    
+    def __init__(self, file_path: str, max_batch: int = 64, max_delay: float = 0.05):
+        self._sink = FileEventSink(file_path)
+        self.file_path = file_path
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
     
     def emit(self, event: TaskEvent) -> None:
-        with open(self.file_path, 'a') as f:
-            json.dump(event.to_dict(), f)
-            f.write('\n')
+        line = serialize_event(event)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._sink.write(line)
+            return
+        if self._writer is None or self._writer.done():
+            self._queue = asyncio.Queue()
+            self._writer = loop.create_task(self._write_batches(self._queue))
+        self._queue.put_nowait(line)
+    
+    async def _write_batches(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[bytes] = [await queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                self._sink.write(b"".join(batch))
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    async def flush(self) -> None:
+        if self._writer is not None and not self._writer.done():
+            await self._queue.join()
+    
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+        if self._queue is not None:
+            pending = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            if pending:
+                self._sink.write(b"".join(pending))
+            self._queue = None
+        self._sink.close()
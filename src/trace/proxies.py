@@ -1,6 +1,6 @@
 from datetime import datetime
 import time
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Type
 
 from openai.types.chat import ChatCompletion
 
@@ -18,7 +18,8 @@ class LLMProxy:
     async def get_response(
         self,
         messages: list,
-        tools: list = None
+        tools: list = None,
+        prompt_cache_key: Optional[str] = None
     ) -> Optional[ChatCompletion]:
         self.event_sink.emit(TaskEvent(
             event_type="llm_request",
@@ -31,7 +32,7 @@ class LLMProxy:
         ))
         
         start_time = time.monotonic()
-        response = await self.real_client.get_response(messages, tools)
+        response = await self.real_client.get_response(messages, tools, prompt_cache_key=prompt_cache_key)
         end_time = time.monotonic()
         duration = end_time - start_time
 
@@ -76,6 +77,42 @@ class LLMProxy:
         ))
         
         return response
+    
+    async def parse(
+        self,
+        messages: list,
+        response_format: Type,
+        temperature: Optional[float] = None,
+        schema: Optional[Dict[str, Any]] = None
+    ):
+        self.event_sink.emit(TaskEvent(
+            event_type="llm_request",
+            trace_id=self.trace_context.trace_id,
+            timestamp=datetime.now(),
+            data={
+                "messages": messages,
+                "response_format": response_format.__name__
+            }
+        ))
+        
+        start_time = time.monotonic()
+        parsed = await self.real_client.parse(
+            messages, response_format, temperature=temperature, schema=schema
+        )
+        duration = time.monotonic() - start_time
+        
+        self.event_sink.emit(TaskEvent(
+            event_type="llm_response",
+            trace_id=self.trace_context.trace_id,
+            timestamp=datetime.now(),
+            data={
+                "response": parsed.model_dump() if parsed is not None else None,
+                "error": None if parsed is not None else "Failed to parse structured response from LLM",
+                "duration_seconds": duration
+            }
+        ))
+        
+        return parsed
 
 
 class ToolProxy:
@@ -85,6 +122,26 @@ class ToolProxy:
         self.event_sink = event_sink
     
     def execute_tool(self, tool_name: str, params: dict) -> str:
+        self._emit_request(tool_name, params)
+        
+        start_time = time.monotonic()
+        output = self.real_executor.execute_tool(tool_name, params)
+        duration = time.monotonic() - start_time
+        
+        self._emit_response(tool_name, output, duration)
+        return output
+    
+    async def execute_tool_async(self, tool_name: str, params: dict) -> str:
+        self._emit_request(tool_name, params)
+        
+        start_time = time.monotonic()
+        output = await self.real_executor.execute_tool_async(tool_name, params)
+        duration = time.monotonic() - start_time
+        
+        self._emit_response(tool_name, output, duration)
+        return output
+    
+    def _emit_request(self, tool_name: str, params: dict):
         self.event_sink.emit(TaskEvent(
             event_type="tool_request",
             trace_id=self.trace_context.trace_id,
@@ -94,12 +151,8 @@ class ToolProxy:
                 "params": params
             }
         ))
-        
-        start_time = time.monotonic()
-        output = self.real_executor.execute_tool(tool_name, params)
-        end_time = time.monotonic()
-        duration = end_time - start_time
-
+    
+    def _emit_response(self, tool_name: str, output: str, duration: float):
         self.event_sink.emit(TaskEvent(
             event_type="tool_response",
             trace_id=self.trace_context.trace_id,
@@ -110,5 +163,3 @@ class ToolProxy:
                 "duration_seconds": duration
             }
         ))
-        
-        return output
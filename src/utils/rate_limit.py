@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket allowing max_rate acquisitions per time_period seconds.
+    Acquiring is free while under budget and only sleeps once the bucket
+    runs dry.
+    """
+    
+    def __init__(self, max_rate: float, time_period: float = 60.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                refill = (now - self._last) * self.max_rate / self.time_period
+                self._tokens = min(float(self.max_rate), self._tokens + refill)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.time_period / self.max_rate)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
@@ -0,0 +1,9 @@
+import yaml
+
+# libyaml's C loader parses several times faster than the pure-Python one;
+# PyYAML builds without libyaml only ship the latter.
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def safe_load(stream):
+    return yaml.load(stream, Loader=SafeLoader)
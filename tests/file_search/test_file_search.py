@@ -0,0 +1,50 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from src.commands.file_search import Command
+
+
+def _make_tree(root: Path) -> Path:
+    (root / "readable").mkdir()
+    (root / "readable" / "match.py").write_text("")
+    locked = root / "locked"
+    locked.mkdir()
+    (locked / "hidden_match.py").write_text("")
+    return locked
+
+
+@pytest.mark.skipif(hasattr(os, "geteuid") and os.geteuid() == 0,
+                    reason="root can read a chmod 000 directory")
+def test_unreadable_subdirectory_is_skipped(tmp_path):
+    locked = _make_tree(tmp_path)
+    locked.chmod(0o000)
+    try:
+        result = Command().execute({"pattern": "*.py", "search_dir": str(tmp_path)})
+    finally:
+        locked.chmod(0o755)
+    
+    assert not result.startswith("Error")
+    assert str(tmp_path / "readable" / "match.py") in result
+    assert "hidden_match.py" not in result
+
+
+def test_scandir_error_skips_only_that_directory(tmp_path, monkeypatch):
+    locked = _make_tree(tmp_path)
+    real_scandir = os.scandir
+    
+    def scandir(path):
+        if os.fspath(path) == str(locked):
+            raise PermissionError(13, "Permission denied", str(locked))
+        return real_scandir(path)
+    
+    monkeypatch.setattr(os, "scandir", scandir)
+    result = Command().execute({"pattern": "*.py", "search_dir": str(tmp_path)})
+    
+    assert not result.startswith("Error")
+    assert str(tmp_path / "readable" / "match.py") in result
+    assert "hidden_match.py" not in result